@@ -17,18 +17,32 @@ Verzia: 2.0
 """
 
 import os
+import sys
 import re
 import json
+import copy
+import math
 import sqlite3
-import urllib.request
+import threading
+import time
+import functools
+import http.client
+import urllib.error
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat, zip_longest
+from operator import attrgetter
 from datetime import datetime, date
+from enum import IntEnum
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, NamedTuple, ClassVar
 from lxml import etree
+from lxml.builder import ElementMaker
 from html.parser import HTMLParser
-import pdfplumber
+
+# pdfplumber sa importuje až v PDFExtractor - príkazy bez PDF (vypocet, over, demo) štartujú rýchlejšie
 
 # Pokus o import OCR knižníc (voliteľné)
 try:
@@ -38,12 +52,110 @@ try:
 except ImportError:
     OCR_AVAILABLE = False
 
+# Rýchlejšia extrakcia textovej vrstvy PDF cez PDFium (voliteľné)
+try:
+    import pypdfium2
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# Rýchlejší JSON parser pre odpovede registrov (voliteľné)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Predkompilované regulárne výrazy pre overovanie v registroch
+_RE_NECISLICE = re.compile(r'\D')
+_RE_ULICA_CISLO = re.compile(r'^(.+?)\s+(\d+[A-Za-z]?(?:/\d+[A-Za-z]?)?)$')
+
+# Číselné bunky tabuliek (desatinná čiarka aj bodka) - bez výnimiek pri neplatných hodnotách
+_RE_FLOAT = re.compile(r'\s*([-+]?(?:\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][-+]?\d+)?)\s*')
+_RE_INT = re.compile(r'\s*([-+]?\d+)\s*')
+
+# Značka nenájdeného záznamu (HTTP 404/410 / prázdny výsledok) - krátko sa pamätá, dotaz sa neopakuje
+_NENAJDENE = {'__not_found__': True}
+
 
 # =============================================================================
 # DÁTOVÉ MODELY
 # =============================================================================
 
-@dataclass
+# Python 3.10+ podporuje dataclass so __slots__ (menšie inštancie, rýchlejší prístup k atribútom)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Bity masky zvýšenia/zníženia sadzby (r14) - Vozidlo.zvysenie_1 / zvysenie_2
+ZVYSENIE_10 = 1 << 0
+ZVYSENIE_20 = 1 << 1
+ZVYSENIE_30 = 1 << 2
+ZVYSENIE_40 = 1 << 3
+ZVYSENIE_50 = 1 << 4
+ZVYSENIA = ((10, ZVYSENIE_10), (20, ZVYSENIE_20), (30, ZVYSENIE_30), (40, ZVYSENIE_40), (50, ZVYSENIE_50))
+
+
+def _zvysenie_property(maska: str, bit: int) -> property:
+    """Booleovský pohľad na jeden bit masky zvýšenia (spätná kompatibilita)."""
+    def citaj(self) -> bool:
+        return bool(getattr(self, maska) & bit)
+    
+    def zapis(self, hodnota: bool):
+        stara = getattr(self, maska)
+        setattr(self, maska, stara | bit if hodnota else stara & ~bit)
+    
+    return property(citaj, zapis)
+
+
+class KatVozidla(IntEnum):
+    """Kategória vozidla (r03); O = iná prípojná kategória mimo O1-O4."""
+    L = 1
+    M1 = 2
+    M2 = 3
+    M3 = 4
+    N1 = 5
+    N2 = 6
+    N3 = 7
+    O = 8
+    O1 = 9
+    O2 = 10
+    O3 = 11
+    O4 = 12
+
+
+_KAT_L_M1 = frozenset({KatVozidla.L, KatVozidla.M1})
+_KAT_L_M1_N1 = frozenset({KatVozidla.L, KatVozidla.M1, KatVozidla.N1})
+_KAT_M3_N3 = frozenset({KatVozidla.M3, KatVozidla.N3})
+_KAT_O = frozenset({KatVozidla.O, KatVozidla.O1, KatVozidla.O2, KatVozidla.O3, KatVozidla.O4})
+
+
+def _kategoria_vozidla(text: str) -> Optional[KatVozidla]:
+    """Normalizuje textovú kategóriu (L3, m1, O4...) na KatVozidla; neznáma = None."""
+    if not text:
+        return None
+    text = text.upper()
+    kat = KatVozidla.__members__.get(text)
+    if kat is not None:
+        return kat
+    if text.startswith('L'):
+        return KatVozidla.L
+    if text.startswith('O'):
+        return KatVozidla.O
+    return None
+
+
+def _parsuj_datum(text: str) -> Optional[date]:
+    """Parsuje dátum vo formáte d.m.rrrr (alebo d/m/rrrr); pri chybe vráti None."""
+    if not text:
+        return None
+    try:
+        parts = text.replace('/', '.').split('.')
+        if len(parts) >= 3:
+            return date(int(parts[2]), int(parts[1]), int(parts[0]))
+    except (ValueError, IndexError):
+        pass
+    return None
+
+@dataclass(**_SLOTS)
 class Adresa:
     """Adresa sídla alebo organizačnej zložky."""
     ulica: str = ""
@@ -55,7 +167,7 @@ class Adresa:
     email_fax: str = ""
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Spolocnost:
     """Údaje o spoločnosti / daňovníkovi."""
     # Typ osoby
@@ -87,7 +199,7 @@ class Spolocnost:
     id: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Vozidlo:
     """Údaje o motorovom vozidle pre daňové priznanie."""
     # Dátumy
@@ -121,19 +233,21 @@ class Vozidlo:
     # Sadzba dane
     sadzba: int = 0  # r13 - Ročná sadzba v EUR
     
-    # Zvýšenie/zníženie sadzby (r14) - Stĺpec 1
-    zvysenie_1_10: bool = False
-    zvysenie_1_20: bool = False
-    zvysenie_1_30: bool = False
-    zvysenie_1_40: bool = False
-    zvysenie_1_50: bool = False
-    
-    # Zvýšenie/zníženie sadzby (r14) - Stĺpec 2
-    zvysenie_2_10: bool = False
-    zvysenie_2_20: bool = False
-    zvysenie_2_30: bool = False
-    zvysenie_2_40: bool = False
-    zvysenie_2_50: bool = False
+    # Zvýšenie/zníženie sadzby (r14) - bitové masky ZVYSENIE_* pre stĺpec 1 a 2.
+    # zvysenie_1_10 ... zvysenie_2_50 sú vlastnosti nad maskami, nie polia: konštruktor ich neprijíma
+    # (Vozidlo(zvysenie_1=ZVYSENIE_10 | ...)), asdict() ich nevráti - na serializáciu slúži na_dict()
+    zvysenie_1: int = 0
+    zvysenie_2: int = 0
+    zvysenie_1_10 = _zvysenie_property('zvysenie_1', ZVYSENIE_10)
+    zvysenie_1_20 = _zvysenie_property('zvysenie_1', ZVYSENIE_20)
+    zvysenie_1_30 = _zvysenie_property('zvysenie_1', ZVYSENIE_30)
+    zvysenie_1_40 = _zvysenie_property('zvysenie_1', ZVYSENIE_40)
+    zvysenie_1_50 = _zvysenie_property('zvysenie_1', ZVYSENIE_50)
+    zvysenie_2_10 = _zvysenie_property('zvysenie_2', ZVYSENIE_10)
+    zvysenie_2_20 = _zvysenie_property('zvysenie_2', ZVYSENIE_20)
+    zvysenie_2_30 = _zvysenie_property('zvysenie_2', ZVYSENIE_30)
+    zvysenie_2_40 = _zvysenie_property('zvysenie_2', ZVYSENIE_40)
+    zvysenie_2_50 = _zvysenie_property('zvysenie_2', ZVYSENIE_50)
     
     # Ročná sadzba po úprave (r15)
     rocna_sadzba_1: float = 0.0
@@ -176,12 +290,86 @@ class Vozidlo:
     # ID pre databázu
     id: Optional[int] = None
     spolocnost_id: Optional[int] = None
+    
+    # Cache parsovaných dátumov (zdrojový text, dátum) - parsuje sa len pri zmene textu
+    _datum_pe_cache: Tuple[str, Optional[date]] = field(default=("", None), init=False, repr=False, compare=False)
+    _datum_vp_cache: Tuple[str, Optional[date]] = field(default=("", None), init=False, repr=False, compare=False)
+    _kat_cache: Tuple[str, Optional[KatVozidla]] = field(default=("", None), init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._kat_cache = (self.kategoria, _kategoria_vozidla(self.kategoria))
+        self._datum_pe_cache = (self.datum_prvej_evidencie, _parsuj_datum(self.datum_prvej_evidencie))
+        self._datum_vp_cache = (self.datum_vzniku_povinnosti, _parsuj_datum(self.datum_vzniku_povinnosti))
+    
+    @property
+    def kat(self) -> Optional[KatVozidla]:
+        """Normalizovaná kategória vozidla (None ak je neznáma)."""
+        zdroj, kat = self._kat_cache
+        if zdroj is not self.kategoria:
+            kat = _kategoria_vozidla(self.kategoria)
+            self._kat_cache = (self.kategoria, kat)
+        return kat
+    
+    @property
+    def datum_prvej_evidencie_d(self) -> Optional[date]:
+        """Dátum prvej evidencie ako `date` (None ak chýba alebo je neplatný)."""
+        zdroj, datum = self._datum_pe_cache
+        if zdroj is not self.datum_prvej_evidencie:
+            datum = _parsuj_datum(self.datum_prvej_evidencie)
+            self._datum_pe_cache = (self.datum_prvej_evidencie, datum)
+        return datum
+    
+    @property
+    def datum_vzniku_povinnosti_d(self) -> Optional[date]:
+        """Dátum vzniku daňovej povinnosti ako `date` (None ak chýba alebo je neplatný)."""
+        zdroj, datum = self._datum_vp_cache
+        if zdroj is not self.datum_vzniku_povinnosti:
+            datum = _parsuj_datum(self.datum_vzniku_povinnosti)
+            self._datum_vp_cache = (self.datum_vzniku_povinnosti, datum)
+        return datum
+    
+    def na_dict(self) -> Dict[str, Any]:
+        """Slovník polí vozidla (bez interných cache) vrátane príznakov zvysenie_1_XX / zvysenie_2_XX."""
+        data = {k: v for k, v in asdict(self).items() if not k.startswith('_')}
+        for stlpec in (1, 2):
+            for percento, _ in ZVYSENIA:
+                kluc = f'zvysenie_{stlpec}_{percento}'
+                data[kluc] = getattr(self, kluc)
+        return data
 
 
 # =============================================================================
 # SADZBY DANE - Zákon 361/2014 Z.z. v znení neskorších predpisov
 # =============================================================================
 
+def _rozvin_pasma(pasma: list, krok: float, predvolena) -> list:
+    """
+    Rozvinie pásma (od, do, hodnota) s intervalom (od, do] do poľa
+    indexovaného hodnotou ceil(x / krok). Hranice pásiem musia byť násobkom kroku.
+    Index 0 zodpovedá x <= 0, posledný index všetkému nad najvyššou hranicou.
+    """
+    horna = max(do for _, do, _ in pasma if do != float('inf'))
+    tabulka = []
+    for i in range(int(horna // krok) + 2):
+        x = i * krok
+        tabulka.append(next((h for od, do, h in pasma if od < x <= do), predvolena))
+    return tabulka
+
+
+def _rozvin_pasma_podla_naprav(pasma: list, krok: float, predvolena) -> Dict[int, list]:
+    """Rozvinie pásma (od, do, napravy, hodnota) do tabuliek podľa počtu náprav."""
+    return {
+        napravy: _rozvin_pasma([(od, do, h) for od, do, n, h in pasma if n == napravy], krok, predvolena)
+        for napravy in {n for _, _, n, _ in pasma}
+    }
+
+
+def _rozvin_upravy_veku(upravy: list) -> list:
+    """Rozvinie pásma (od, do, koef) s intervalom [od, do) do poľa indexovaného mesiacmi."""
+    posledne_od = upravy[-1][0]
+    return [next(k for od, do, k in upravy if od <= m < do) for m in range(int(posledne_od) + 1)]
+
+
 class SadzbyDane:
     """
     Sadzby dane z motorových vozidiel podľa zákona 361/2014 Z.z.
@@ -234,6 +422,8 @@ class SadzbyDane:
         (30, 32, 4, 902), (32, 34, 4, 1019), (34, 36, 4, 1166),
         (36, 38, 4, 1282), (38, 40, 4, 1417),
     ]
+    # (dolná hranica pásma, nápravy) -> sadzba; pásma sú široké 2 t
+    SADZBY_M3_N3_BA_BB_MAP = {(od, napravy): sadzba for od, do, napravy, sadzba in SADZBY_M3_N3_BA_BB}
     
     # Príloha č. 1e - Sadzby pre kategóriu O (prípojné vozidlá)
     SADZBY_O = {'O1': 50, 'O2': 115, 'O3': 180, 'O4': 295}
@@ -258,19 +448,32 @@ class SadzbyDane:
         (180, float('inf'), 1.50),  # +50%
     ]
     
+    # Predpočítané vyhľadávacie tabuľky (index = pásmo objemu / hmotnosti / veku)
+    # Priamy index do zoznamu je O(1) - rýchlejší než binárne vyhľadávanie (bisect/searchsorted)
+    _M1_PO_50CM3 = _rozvin_pasma(SADZBY_M1_OBJEM, 50, SADZBY_M1_OBJEM[-1][2])
+    _N1_PODLA_NAPRAV = _rozvin_pasma_podla_naprav(SADZBY_N1, 1, 115)
+    _VEK_2024 = _rozvin_upravy_veku(UPRAVA_PODLA_VEKU_2024)
+    _VEK_2025 = _rozvin_upravy_veku(UPRAVA_PODLA_VEKU_2025)
+    
     @classmethod
     def get_zakladna_sadzba_m1(cls, objem_cm3: float) -> int:
-        for od, do, sadzba in cls.SADZBY_M1_OBJEM:
-            if od < objem_cm3 <= do:
-                return sadzba
-        return cls.SADZBY_M1_OBJEM[-1][2]
+        tabulka = cls._M1_PO_50CM3
+        i = math.ceil(objem_cm3 / 50) if objem_cm3 > 0 else 0
+        return tabulka[min(i, len(tabulka) - 1)]
     
     @classmethod
     def get_zakladna_sadzba_n1(cls, hmotnost_t: float, napravy: int) -> int:
-        for od, do, nap, sadzba in cls.SADZBY_N1:
-            if od < hmotnost_t <= do and nap == napravy:
-                return sadzba
-        return 115
+        tabulka = cls._N1_PODLA_NAPRAV.get(napravy)
+        if tabulka is None:
+            return 115
+        i = math.ceil(hmotnost_t) if hmotnost_t > 0 else 0
+        return tabulka[min(i, len(tabulka) - 1)]
+    
+    @classmethod
+    def get_zakladna_sadzba_m3_n3(cls, hmotnost_t: float, napravy: int) -> int:
+        # Interval (od, do] ako pri N1 - 14.0 t patrí do pásma 12-14
+        pasmo = (math.ceil(hmotnost_t / 2) - 1) * 2
+        return cls.SADZBY_M3_N3_BA_BB_MAP.get((pasmo, napravy), 115)
     
     @classmethod
     def get_zakladna_sadzba_o(cls, kategoria: str) -> int:
@@ -278,11 +481,25 @@ class SadzbyDane:
     
     @classmethod
     def get_koeficient_veku(cls, mesiace: int, rok: int = 2024) -> float:
-        upravy = cls.UPRAVA_PODLA_VEKU_2025 if rok >= 2025 else cls.UPRAVA_PODLA_VEKU_2024
-        for od, do, koef in upravy:
-            if od <= mesiace < do:
-                return koef
-        return upravy[-1][2]
+        tabulka = cls._VEK_2025 if rok >= 2025 else cls._VEK_2024
+        if 0 <= mesiace < len(tabulka):
+            return tabulka[int(mesiace)]
+        return tabulka[-1]
+
+
+class VypocetDane(NamedTuple):
+    """Výsledok výpočtu dane pre jedno vozidlo."""
+    zakladna_sadzba: int = 0
+    vek_mesiacov: int = 0
+    koeficient_veku: float = 1.0
+    sadzba_po_veku: float = 0.0
+    koeficient_eko: float = 1.0
+    sadzba_po_eko: float = 0.0
+    sadzba_finalna: float = 0.0
+    mesiacov: int = 12
+    dan: float = 0.0
+    r11_pismeno: str = ''
+    zvysenie_percento: int = 0
 
 
 class KalkulatorDane:
@@ -291,136 +508,125 @@ class KalkulatorDane:
     def __init__(self, rok: int = 2024):
         self.rok = rok
         self.koniec_obdobia = date(rok, 12, 31)
-    
-    def vypocitaj_vek_v_mesiacoch(self, datum_prvej_evidencie: str) -> int:
-        if not datum_prvej_evidencie:
+        # Rok a mesiac konca obdobia ako int - výpočet veku bez atribútov date
+        self._end_y, self._end_m = rok, 12
+    
+    def vypocitaj_vek_v_mesiacoch(self, datum_prvej_evidencie) -> int:
+        """Vek vozidla v mesiacoch ku koncu obdobia; prijíma `date` alebo text d.m.rrrr."""
+        if isinstance(datum_prvej_evidencie, str):
+            datum_prvej_evidencie = _parsuj_datum(datum_prvej_evidencie)
+        if datum_prvej_evidencie is None:
             return 0
-        try:
-            parts = datum_prvej_evidencie.replace('/', '.').split('.')
-            if len(parts) >= 3:
-                datum = date(int(parts[2]), int(parts[1]), int(parts[0]))
-                mesiace = (self.koniec_obdobia.year - datum.year) * 12
-                mesiace += self.koniec_obdobia.month - datum.month
-                return max(0, mesiace)
-        except (ValueError, IndexError):
-            pass
-        return 0
+        return max(0, (self._end_y - datum_prvej_evidencie.year) * 12 + self._end_m - datum_prvej_evidencie.month)
     
     def get_zakladna_sadzba(self, vozidlo: Vozidlo) -> int:
-        kategoria = vozidlo.kategoria.upper() if vozidlo.kategoria else ""
+        kat = vozidlo.kat
         
         # Elektromobily
         if vozidlo.vykon_motora > 0 and vozidlo.objem_valcov == 0:
-            if kategoria in ['L', 'M1', 'N1'] or kategoria.startswith('L'):
+            if kat in _KAT_L_M1_N1:
                 return 0
         
         # M1 a L - podľa objemu
-        if kategoria in ['L', 'M1'] or kategoria.startswith('L'):
+        if kat in _KAT_L_M1:
             return SadzbyDane.get_zakladna_sadzba_m1(vozidlo.objem_valcov)
         
         hmotnost_t = vozidlo.hmotnost / 1000 if vozidlo.hmotnost else 0
         napravy = vozidlo.pocet_naprav or 2
         
         # N1
-        if kategoria == 'N1':
+        if kat is KatVozidla.N1:
             return SadzbyDane.get_zakladna_sadzba_n1(hmotnost_t, napravy)
         
+        # M3, N3 - podľa hmotnosti a počtu náprav
+        if kat in _KAT_M3_N3:
+            return SadzbyDane.get_zakladna_sadzba_m3_n3(hmotnost_t, napravy)
+        
         # O kategórie
-        if kategoria.startswith('O'):
-            return SadzbyDane.get_zakladna_sadzba_o(kategoria)
+        if kat in _KAT_O:
+            return SadzbyDane.get_zakladna_sadzba_o(kat.name)
         
         # Default
         if vozidlo.objem_valcov > 0:
             return SadzbyDane.get_zakladna_sadzba_m1(vozidlo.objem_valcov)
         return 115
     
-    def vypocitaj_dan(self, vozidlo: Vozidlo, mesiacov_pouzitia: int = 12) -> Dict[str, Any]:
-        result = {
-            'zakladna_sadzba': 0, 'vek_mesiacov': 0, 'koeficient_veku': 1.0,
-            'sadzba_po_veku': 0.0, 'koeficient_eko': 1.0, 'sadzba_po_eko': 0.0,
-            'sadzba_finalna': 0.0, 'mesiacov': mesiacov_pouzitia, 'dan': 0.0,
-            'r11_pismeno': '', 'zvysenie_percento': 0,
-        }
-        
+    def vypocitaj_dan(self, vozidlo: Vozidlo, mesiacov_pouzitia: int = 12) -> VypocetDane:
         zakladna = self.get_zakladna_sadzba(vozidlo)
-        result['zakladna_sadzba'] = zakladna
         if zakladna == 0:
-            return result
+            return VypocetDane(mesiacov=mesiacov_pouzitia)
         
-        vek = self.vypocitaj_vek_v_mesiacoch(vozidlo.datum_prvej_evidencie)
-        result['vek_mesiacov'] = vek
+        vek = self.vypocitaj_vek_v_mesiacoch(vozidlo.datum_prvej_evidencie_d)
         
-        kategoria = vozidlo.kategoria.upper() if vozidlo.kategoria else ""
+        kat = vozidlo.kat
         
         # O4 v 2024 má -60%
-        if kategoria == 'O4' and self.rok == 2024:
+        if kat is KatVozidla.O4 and self.rok == 2024:
             koef_veku = 0.40
-        elif kategoria.startswith('O'):
+        elif kat in _KAT_O:
             koef_veku = 1.0
         else:
             koef_veku = SadzbyDane.get_koeficient_veku(vek, self.rok)
         
-        result['koeficient_veku'] = koef_veku
-        result['sadzba_po_veku'] = zakladna * koef_veku
+        sadzba_po_veku = zakladna * koef_veku
         
         if koef_veku < 1.0:
-            result['zvysenie_percento'] = int((1.0 - koef_veku) * -100)
+            zvysenie_percento = int((1.0 - koef_veku) * -100)
         else:
-            result['zvysenie_percento'] = int((koef_veku - 1.0) * 100)
+            zvysenie_percento = int((koef_veku - 1.0) * 100)
         
         # Ekologické vozidlá -50%
         koef_eko = 1.0
         if vozidlo.hybrid or vozidlo.plyn or vozidlo.vodik:
             if self.rok >= 2025:
-                if kategoria in ['L', 'M1', 'N1'] or kategoria.startswith('L'):
+                if kat in _KAT_L_M1_N1:
                     koef_eko = 0.50
             else:
                 koef_eko = 0.50
         
-        result['koeficient_eko'] = koef_eko
-        result['sadzba_po_eko'] = result['sadzba_po_veku'] * koef_eko
+        sadzba_po_eko = sadzba_po_veku * koef_eko
         
         # Kombinovaná doprava -50%
         if vozidlo.kombi_doprava:
-            result['sadzba_finalna'] = result['sadzba_po_eko'] * 0.50
+            sadzba_finalna = sadzba_po_eko * 0.50
         else:
-            result['sadzba_finalna'] = result['sadzba_po_eko']
+            sadzba_finalna = sadzba_po_eko
         
-        dan = (result['sadzba_finalna'] / 12) * mesiacov_pouzitia
-        result['dan'] = round(dan, 2)
-        return result
+        dan = (sadzba_finalna / 12) * mesiacov_pouzitia
+        return VypocetDane(
+            zakladna, vek, koef_veku, sadzba_po_veku, koef_eko, sadzba_po_eko,
+            sadzba_finalna, mesiacov_pouzitia, round(dan, 2), '', zvysenie_percento,
+        )
     
     def vypocitaj_dan_pre_vozidlo(self, vozidlo: Vozidlo) -> Vozidlo:
         mesiacov = vozidlo.pocet_mesiacov_1
         if mesiacov == 0:
-            if vozidlo.datum_vzniku_povinnosti:
-                try:
-                    parts = vozidlo.datum_vzniku_povinnosti.split('.')
-                    mesiacov = 13 - int(parts[1])
-                except:
-                    mesiacov = 12
-            else:
-                mesiacov = 12
+            datum_vzniku = vozidlo.datum_vzniku_povinnosti_d
+            mesiacov = 13 - datum_vzniku.month if datum_vzniku else 12
         
         vypocet = self.vypocitaj_dan(vozidlo, mesiacov)
         
-        vozidlo.sadzba = int(vypocet['zakladna_sadzba'])
-        vozidlo.rocna_sadzba_1 = round(vypocet['sadzba_po_veku'], 2)
-        vozidlo.sadzba_po_znizeni_1 = round(vypocet['sadzba_po_eko'], 2)
-        vozidlo.sadzba_kombi_1 = round(vypocet['sadzba_finalna'], 2)
+        vozidlo.sadzba = int(vypocet.zakladna_sadzba)
+        vozidlo.rocna_sadzba_1 = round(vypocet.sadzba_po_veku, 2)
+        vozidlo.sadzba_po_znizeni_1 = round(vypocet.sadzba_po_eko, 2)
+        vozidlo.sadzba_kombi_1 = round(vypocet.sadzba_finalna, 2)
         vozidlo.pocet_mesiacov_1 = mesiacov
-        vozidlo.dan_1 = vypocet['dan']
-        vozidlo.r22 = vypocet['dan']
+        vozidlo.dan_1 = vypocet.dan
+        vozidlo.r22 = vypocet.dan
         
-        percento = vypocet['zvysenie_percento']
-        if self.rok >= 2025:
-            if percento >= 50: vozidlo.zvysenie_1_50 = True
-            elif percento >= 40: vozidlo.zvysenie_1_40 = True
-            elif percento >= 30: vozidlo.zvysenie_1_30 = True
-            elif percento >= 20: vozidlo.zvysenie_1_20 = True
-            elif percento >= 10: vozidlo.zvysenie_1_10 = True
+        percento = vypocet.zvysenie_percento
+        if self.rok >= 2025 and percento >= 10:
+            # Pásmo 10/20/.../50 % -> bit 0..4 masky (ZVYSENIE_10 .. ZVYSENIE_50)
+            vozidlo.zvysenie_1 |= 1 << (min(50, percento) // 10 - 1)
         
         return vozidlo
+    
+    def vypocitaj_dan_pre_vozidla(self, vozidla: List[Vozidlo]) -> List[Vozidlo]:
+        """Vypočíta daň pre celý zoznam vozidiel naraz (výsledky zapíše do vozidiel)."""
+        vypocitaj = self.vypocitaj_dan_pre_vozidlo
+        for vozidlo in vozidla:
+            vypocitaj(vozidlo)
+        return vozidla
 
 
 # =============================================================================
@@ -435,34 +641,197 @@ class RegisterConnector:
     # RÚZ API - Register účtovných závierok  
     RUZ_API_URL = "https://www.registeruz.sk/cruz-public/api"
     TIMEOUT = 15
+    MAX_WORKERS = 8  # Paralelné overovanie viacerých spoločností
+    CACHE_TTL = 30 * 24 * 3600  # Platnosť perzistentnej cache (30 dní)
+    CACHE_TTL_NENAJDENE = 60  # Platnosť záznamu "nenájdené" v pamäti (sekundy)
+    CACHE_MAXSIZE = 1024  # Max. počet záznamov v pamäťovej cache
+    RETRIES = 3  # Počet pokusov pri dočasných chybách (5xx, timeout)
+    HEADERS = {
+        'User-Agent': 'DMVProcessor/2.0',
+        'Accept': 'application/json',
+    }
+    # Polia adresy RPO a ich alternatívne kľúče podľa verzie API
+    RPO_ADRESA_KLUCE = (
+        ('ulica', ('street', 'streetName')),
+        ('cislo', ('buildingNumber', 'regNumber')),
+        ('psc', ('postalCode',)),
+        ('obec', ('municipality', 'city')),
+    )
     
-    def __init__(self):
-        self.cache = {}
-    
-    def _http_get_json(self, url: str, params: dict = None) -> Optional[dict]:
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache: Dict[str, Tuple[float, Any]] = {}  # kľúč -> (expirácia podľa time.monotonic, dáta)
+        self._lokalne = threading.local()  # Keep-alive HTTP spojenia pre každé vlákno
+        self._rpo_adresa_kluce = None  # Kľúče adresy zistené z prvej odpovede RPO
+        
+        # Perzistentná cache úspešných odpovedí (SQLite), zdieľaná medzi behmi programu
+        self._cache_db = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            try:
+                self._cache_db = sqlite3.connect(cache_path, check_same_thread=False)
+                self._cache_db.execute("PRAGMA journal_mode=WAL")
+                self._cache_db.execute("PRAGMA synchronous=NORMAL")
+                self._cache_db.execute("""
+                    CREATE TABLE IF NOT EXISTS register_cache (
+                        kluc TEXT PRIMARY KEY,
+                        ziskane INTEGER NOT NULL,
+                        data TEXT NOT NULL
+                    )
+                """)
+                self._cache_db.commit()
+            except sqlite3.Error as e:
+                print(f"Cache registrov nie je dostupná: {e}")
+                self._cache_db = None
+    
+    def clear_cache(self) -> None:
+        """Vyprázdni pamäťovú aj perzistentnú (SQLite) cache odpovedí registrov."""
+        with self._cache_lock:
+            self.cache.clear()
+            if self._cache_db is None:
+                return
+            try:
+                self._cache_db.execute("DELETE FROM register_cache")
+                self._cache_db.commit()
+            except sqlite3.Error as e:
+                print(f"Chyba cache registrov: {e}")
+    
+    def _do_pamate(self, kluc: str, data: Dict[str, Any], ttl: float) -> None:
+        """Uloží výsledok do pamäťovej cache s expiráciou; pri plnej cache vyhodí najstarší záznam."""
+        with self._cache_lock:
+            self.cache.pop(kluc, None)
+            if len(self.cache) >= self.CACHE_MAXSIZE:
+                del self.cache[next(iter(self.cache))]
+            self.cache[kluc] = (time.monotonic() + ttl, data)
+    
+    def _z_cache(self, kluc: str) -> Optional[Dict[str, Any]]:
+        """Vráti uložený výsledok z pamäte alebo z perzistentnej cache (ak nevypršal)."""
+        zaznam = self.cache.get(kluc)
+        if zaznam is not None:
+            if zaznam[0] > time.monotonic():
+                return zaznam[1]
+            with self._cache_lock:
+                self.cache.pop(kluc, None)
+        if self._cache_db is None:
+            return None
+        teraz = int(time.time())
         try:
-            if params:
-                url = f"{url}?{urllib.parse.urlencode(params)}"
-            req = urllib.request.Request(url, headers={
-                'User-Agent': 'DMVProcessor/2.0',
-                'Accept': 'application/json',
-            })
-            with urllib.request.urlopen(req, timeout=self.TIMEOUT) as response:
-                return json.loads(response.read().decode('utf-8'))
-        except Exception as e:
-            print(f"HTTP/JSON chyba pre {url}: {e}")
+            with self._cache_lock:
+                row = self._cache_db.execute(
+                    "SELECT ziskane, data FROM register_cache WHERE kluc = ? AND ziskane > ?",
+                    (kluc, teraz - self.CACHE_TTL)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Chyba cache registrov: {e}")
+            return None
+        if row is None:
             return None
+        data = json.loads(row[1])
+        self._do_pamate(kluc, data, row[0] + self.CACHE_TTL - teraz)
+        return data
+    
+    def _do_cache(self, kluc: str, data: Dict[str, Any]):
+        """Uloží úspešný výsledok do pamäte aj do perzistentnej cache."""
+        self._do_pamate(kluc, data, self.CACHE_TTL)
+        if self._cache_db is None:
+            return
+        try:
+            with self._cache_lock:
+                self._cache_db.execute(
+                    "INSERT OR REPLACE INTO register_cache (kluc, ziskane, data) VALUES (?, ?, ?)",
+                    (kluc, int(time.time()), json.dumps(data, ensure_ascii=False))
+                )
+                self._cache_db.commit()
+        except sqlite3.Error as e:
+            print(f"Chyba cache registrov: {e}")
+    
+    def _spojenie(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        """Vráti perzistentné HTTP(S) spojenie pre daný server a aktuálne vlákno."""
+        spojenia = getattr(self._lokalne, 'spojenia', None)
+        if spojenia is None:
+            spojenia = self._lokalne.spojenia = {}
+        conn = spojenia.get((scheme, host))
+        if conn is None:
+            trieda = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = spojenia[(scheme, host)] = trieda(host, timeout=self.TIMEOUT)
+        return conn
+    
+    def _http_get(self, url: str) -> Tuple[http.client.HTTPResponse, bytes]:
+        """GET cez keep-alive spojenie; po zatvorení spojenia serverom sa pripojí znova."""
+        for _ in range(5):  # Presmerovania
+            casti = urllib.parse.urlsplit(url)
+            cesta = (casti.path or '/') + (f"?{casti.query}" if casti.query else '')
+            conn = self._spojenie(casti.scheme, casti.netloc)
+            for pokus in range(2):
+                try:
+                    conn.request('GET', cesta, headers=self.HEADERS)
+                    response = conn.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # Server medzičasom zavrel nečinné spojenie - skús raz nanovo
+                    conn.close()
+                    if pokus:
+                        raise
+                except Exception:
+                    conn.close()
+                    raise
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+            return response, body
+        raise urllib.error.URLError(f"Príliš veľa presmerovaní: {url}")
+    
+    def _http_get_json(self, url: str, params: dict = None) -> Optional[dict]:
+        """
+        Stiahne a parsuje JSON. Pri HTTP 404/410 vráti _NENAJDENE, pri inej 4xx None
+        (bez opakovania); dočasné chyby (5xx, 408, 429, timeout, spojenie) opakuje s backoffom.
+        """
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        chyba = None
+        for pokus in range(self.RETRIES):
+            try:
+                _, body = self._http_get(url)
+                return _json_loads(body)
+            except urllib.error.HTTPError as e:
+                if e.code in (404, 410):
+                    print(f"HTTP chyba pre {url}: {e}")
+                    return _NENAJDENE
+                if e.code < 500 and e.code not in (408, 429):
+                    print(f"HTTP chyba pre {url}: {e}")
+                    return None
+                chyba = e
+            except (OSError, http.client.HTTPException) as e:
+                chyba = e
+            except ValueError as e:
+                print(f"JSON chyba pre {url}: {e}")
+                return None
+            if pokus + 1 < self.RETRIES:
+                time.sleep(2 ** pokus * 0.2)
+        print(f"HTTP chyba pre {url}: {chyba}")
+        return None
+    
+    def _nenajdene(self, cache_key: str) -> None:
+        """Zapamätá si (len v pamäti, na CACHE_TTL_NENAJDENE), že subjekt v registri neexistuje."""
+        self._do_pamate(cache_key, _NENAJDENE, self.CACHE_TTL_NENAJDENE)
+        return None
     
     def vyhladaj_v_rpo_podla_ico(self, ico: str) -> Optional[Dict[str, Any]]:
         """Vyhľadá subjekt v RPO (Register právnických osôb) podľa IČO."""
-        ico = re.sub(r'\D', '', ico).zfill(8)
+        ico = _RE_NECISLICE.sub('', ico).zfill(8)
         
         cache_key = f"rpo_{ico}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self._z_cache(cache_key)
+        if cached is not None:
+            return None if cached is _NENAJDENE else cached
         
         # 1. Vyhľadanie podľa IČO
         search_data = self._http_get_json(f"{self.RPO_API_URL}/search", {'identifier': ico})
+        if search_data is _NENAJDENE:
+            return self._nenajdene(cache_key)
         if not search_data:
             return None
         
@@ -478,10 +847,12 @@ class RegisterConnector:
         
         if not org_id:
             print(f"RPO: IČO {ico} nenájdené")
-            return None
+            return self._nenajdene(cache_key)
         
         # 2. Získaj detail organizácie
         detail = self._http_get_json(f"{self.RPO_API_URL}/organizations/{org_id}")
+        if detail is _NENAJDENE:
+            return self._nenajdene(cache_key)
         if not detail:
             return None
         
@@ -512,17 +883,10 @@ class RegisterConnector:
         if 'addresses' in detail:
             for addr in detail['addresses']:
                 if addr.get('effectiveTo') is None:  # Aktuálna adresa
-                    result['ulica'] = addr.get('street', '') or addr.get('streetName', '')
-                    result['cislo'] = addr.get('buildingNumber', '') or addr.get('regNumber', '')
-                    result['psc'] = addr.get('postalCode', '') or ''
-                    result['obec'] = addr.get('municipality', '') or addr.get('city', '')
+                    self._extrahuj_adresu_rpo(addr, result)
                     break
         elif 'address' in detail:
-            addr = detail['address']
-            result['ulica'] = addr.get('street', '') or addr.get('streetName', '')
-            result['cislo'] = addr.get('buildingNumber', '') or addr.get('regNumber', '')
-            result['psc'] = addr.get('postalCode', '') or ''
-            result['obec'] = addr.get('municipality', '') or addr.get('city', '')
+            self._extrahuj_adresu_rpo(detail['address'], result)
         
         # DIČ - hľadaj v identifikátoroch
         if 'identifiers' in detail:
@@ -532,18 +896,42 @@ class RegisterConnector:
                     break
         
         if result['nazov']:
-            self.cache[cache_key] = result
+            self._do_cache(cache_key, result)
             print(f"RPO: Nájdené - {result['nazov']}")
         
         return result if result['nazov'] else None
     
+    def _extrahuj_adresu_rpo(self, addr: Dict[str, Any], result: Dict[str, Any]):
+        """
+        Prenesie adresu z odpovede RPO do výsledku. Ktorý z alternatívnych kľúčov
+        API používa, sa zistí z prvej adresy; ďalšie už čítajú priamo jeden kľúč.
+        """
+        kluce = self._rpo_adresa_kluce
+        if kluce is not None:
+            try:
+                for pole, kluc in kluce:
+                    result[pole] = addr[kluc] or ''
+                return
+            except KeyError:
+                pass  # Iná schéma odpovede - zisti kľúče znovu
+        
+        kluce = tuple(
+            (pole, next((k for k in alternativy if addr.get(k)), alternativy[0]))
+            for pole, alternativy in self.RPO_ADRESA_KLUCE
+        )
+        if all(kluc in addr for _, kluc in kluce):
+            self._rpo_adresa_kluce = kluce
+        for pole, kluc in kluce:
+            result[pole] = addr.get(kluc) or ''
+    
     def vyhladaj_v_ruz_podla_ico(self, ico: str) -> Optional[Dict[str, Any]]:
         """Vyhľadá subjekt v Registri účtovných závierok podľa IČO."""
-        ico = re.sub(r'\D', '', ico).zfill(8)
+        ico = _RE_NECISLICE.sub('', ico).zfill(8)
         
         cache_key = f"ruz_{ico}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self._z_cache(cache_key)
+        if cached is not None:
+            return None if cached is _NENAJDENE else cached
         
         # 1. Najprv získaj ID účtovnej jednotky
         search_data = self._http_get_json(f"{self.RUZ_API_URL}/uctovne-jednotky", {
@@ -553,17 +941,21 @@ class RegisterConnector:
             'ico': ico
         })
         
+        if search_data is _NENAJDENE:
+            return self._nenajdene(cache_key)
         if not search_data or 'id' not in search_data:
             return None
         
         uctj_ids = search_data.get('id', [])
         if not uctj_ids or (isinstance(uctj_ids, list) and len(uctj_ids) == 0):
-            return None
+            return self._nenajdene(cache_key)
         
         uctj_id = uctj_ids[0] if isinstance(uctj_ids, list) else uctj_ids
         
         # 2. Získaj detail účtovnej jednotky
         detail = self._http_get_json(f"{self.RUZ_API_URL}/uctovna-jednotka", {'id': uctj_id})
+        if detail is _NENAJDENE:
+            return self._nenajdene(cache_key)
         if not detail:
             return None
         
@@ -580,13 +972,13 @@ class RegisterConnector:
         
         # Skús oddeliť číslo od ulice
         if result['ulica']:
-            match = re.match(r'^(.+?)\s+(\d+[A-Za-z]?(?:/\d+[A-Za-z]?)?)$', result['ulica'])
+            match = _RE_ULICA_CISLO.match(result['ulica'])
             if match:
                 result['ulica'] = match.group(1)
                 result['cislo'] = match.group(2)
         
         if result['nazov']:
-            self.cache[cache_key] = result
+            self._do_cache(cache_key, result)
             print(f"RÚZ: Nájdené - {result['nazov']}")
         
         return result if result['nazov'] else None
@@ -601,7 +993,7 @@ class RegisterConnector:
         ico = None
         
         if spolocnost.dic:
-            dic_clean = re.sub(r'\D', '', spolocnost.dic)
+            dic_clean = _RE_NECISLICE.sub('', spolocnost.dic)
             if len(dic_clean) >= 8:
                 if dic_clean.startswith('20'):
                     ico = dic_clean[2:10]
@@ -645,9 +1037,16 @@ class RegisterConnector:
             spolocnost.sidlo.obec = data['obec']
         
         return spolocnost, True
+    
+    def over_a_doplni_spolocnosti(self, spolocnosti: List[Spolocnost]) -> List[Tuple[Spolocnost, bool]]:
+        """Overí a doplní viacero spoločností paralelne; výsledky sú v poradí vstupu."""
+        if len(spolocnosti) <= 1:
+            return [self.over_a_doplni_spolocnost(s) for s in spolocnosti]
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(spolocnosti))) as executor:
+            return list(executor.map(self.over_a_doplni_spolocnost, spolocnosti))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DanovePriznanie:
     """Kompletné daňové priznanie k dani z motorových vozidiel."""
     # Typ priznania
@@ -722,17 +1121,140 @@ class DanovePriznanie:
 # DATABÁZA
 # =============================================================================
 
+# Stĺpce načítavané do Spolocnost / Vozidlo (bez časových pečiatok vytvorene/aktualizovane)
+_SQL_STLPCE_SPOLOCNOSTI = """
+    id, dic, fo, po, zahranicna, datum_narodenia,
+    fo_priezvisko, fo_meno, fo_titul, fo_titul_za, fo_obchodne_meno,
+    po_obchodne_meno,
+    sidlo_ulica, sidlo_cislo, sidlo_psc, sidlo_obec, sidlo_stat,
+    sidlo_telefon, sidlo_email,
+    org_ulica, org_cislo, org_psc, org_obec, org_telefon, org_email
+"""
+_SQL_STLPCE_VOZIDLA = """
+    id, spolocnost_id, evc, kategoria, objem_valcov, vykon_motora,
+    hmotnost, pocet_naprav, datum_prvej_evidencie, hybrid, plyn, vodik
+"""
+_SQL_SPOLOCNOST_PODLA_DIC = f"SELECT {_SQL_STLPCE_SPOLOCNOSTI} FROM spolocnosti WHERE dic = ?"
+_SQL_ZOZNAM_SPOLOCNOSTI = f"SELECT {_SQL_STLPCE_SPOLOCNOSTI} FROM spolocnosti ORDER BY po_obchodne_meno"
+_SQL_VOZIDLA_SPOLOCNOSTI = f"SELECT {_SQL_STLPCE_VOZIDLA} FROM vozidla WHERE spolocnost_id = ?"
+
+# Upsert spoločnosti podľa DIČ
+_SQL_UPSERT_SPOLOCNOST = """
+    INSERT INTO spolocnosti (
+        dic, fo, po, zahranicna, datum_narodenia,
+        fo_priezvisko, fo_meno, fo_titul, fo_titul_za, fo_obchodne_meno,
+        po_obchodne_meno,
+        sidlo_ulica, sidlo_cislo, sidlo_psc, sidlo_obec, sidlo_stat,
+        sidlo_telefon, sidlo_email,
+        org_ulica, org_cislo, org_psc, org_obec, org_telefon, org_email
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(dic) DO UPDATE SET
+        fo = excluded.fo,
+        po = excluded.po,
+        zahranicna = excluded.zahranicna,
+        datum_narodenia = excluded.datum_narodenia,
+        fo_priezvisko = excluded.fo_priezvisko,
+        fo_meno = excluded.fo_meno,
+        fo_titul = excluded.fo_titul,
+        fo_titul_za = excluded.fo_titul_za,
+        fo_obchodne_meno = excluded.fo_obchodne_meno,
+        po_obchodne_meno = excluded.po_obchodne_meno,
+        sidlo_ulica = excluded.sidlo_ulica,
+        sidlo_cislo = excluded.sidlo_cislo,
+        sidlo_psc = excluded.sidlo_psc,
+        sidlo_obec = excluded.sidlo_obec,
+        sidlo_stat = excluded.sidlo_stat,
+        sidlo_telefon = excluded.sidlo_telefon,
+        sidlo_email = excluded.sidlo_email,
+        org_ulica = excluded.org_ulica,
+        org_cislo = excluded.org_cislo,
+        org_psc = excluded.org_psc,
+        org_obec = excluded.org_obec,
+        org_telefon = excluded.org_telefon,
+        org_email = excluded.org_email,
+        aktualizovane = CURRENT_TIMESTAMP
+"""
+
+# Upsert vozidla - spoločný pre uloz_vozidlo aj uloz_vozidla_hromadne
+_SQL_UPSERT_VOZIDLO = """
+    INSERT INTO vozidla (
+        spolocnost_id, evc, kategoria, objem_valcov, vykon_motora,
+        hmotnost, pocet_naprav, datum_prvej_evidencie,
+        hybrid, plyn, vodik
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(spolocnost_id, evc) DO UPDATE SET
+        kategoria = excluded.kategoria,
+        objem_valcov = excluded.objem_valcov,
+        vykon_motora = excluded.vykon_motora,
+        hmotnost = excluded.hmotnost,
+        pocet_naprav = excluded.pocet_naprav,
+        datum_prvej_evidencie = excluded.datum_prvej_evidencie,
+        hybrid = excluded.hybrid,
+        plyn = excluded.plyn,
+        vodik = excluded.vodik,
+        aktualizovane = CURRENT_TIMESTAMP
+"""
+
+# Id po upserte podľa prirodzeného kľúča - lastrowid zdieľaného spojenia pri UPDATE vetve neplatí
+_SQL_ID_SPOLOCNOSTI = "SELECT id FROM spolocnosti WHERE dic = ?"
+_SQL_ID_VOZIDLA = "SELECT id FROM vozidla WHERE spolocnost_id = ? AND evc = ?"
+
+
 class Database:
     """SQLite databáza pre ukladanie spoločností a vozidiel."""
     
     def __init__(self, db_path: str = "dmv_database.db"):
         self.db_path = db_path
+        # Jedno spojenie na celý život objektu (autocommit); prístup z viacerých vlákien stráži zámok
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None, cached_statements=128
+        )
+        # LRU cache riadkov spoločností podľa DIČ (viazaná na inštanciu, čistí sa pri zápise)
+        self._riadok_spolocnosti = functools.lru_cache(maxsize=1024)(self._nacitaj_riadok_spolocnosti)
         self._init_db()
     
+    def close(self):
+        """Zatvorí databázové spojenie."""
+        with self.lock:
+            self.conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Explicitná transakcia (BEGIN IMMEDIATE / COMMIT, pri chybe ROLLBACK).
+        Vnorené použitie sa pripojí k vonkajšej transakcii - celá dávka má jeden commit.
+        """
+        with self.lock:
+            if self.conn.in_transaction:
+                yield self.conn
+                return
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                self._riadok_spolocnosti.cache_clear()  # Cache mohla načítať odvolané riadky
+                raise
+            self.conn.execute("COMMIT")
+    
     def _init_db(self):
         """Inicializácia databázových tabuliek."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.lock:
+            # Riadky ako sqlite3.Row - prístup k stĺpcom podľa mena
+            self.conn.row_factory = sqlite3.Row
+            cursor = self.conn.cursor()
+            # WAL: čitatelia neblokujú zápis, commit bez fsync pri každom zápise
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB
+            cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+            cursor.execute("PRAGMA busy_timeout=5000")
+            self._vytvor_tabulky(cursor)
+    
+    def _vytvor_tabulky(self, cursor: sqlite3.Cursor):
+        """Vytvorí tabuľky, ak ešte neexistujú."""
         
         # Tabuľka spoločností
         cursor.execute("""
@@ -805,176 +1327,169 @@ class Database:
             )
         """)
         
-        conn.commit()
-        conn.close()
+        # Vozidlá podľa spolocnost_id pokrýva index z UNIQUE(spolocnost_id, evc)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_danove_priznania_spolocnost
+            ON danove_priznania(spolocnost_id, rok)
+        """)
     
     def uloz_spolocnost(self, spolocnost: Spolocnost) -> int:
         """Uloží alebo aktualizuje spoločnosť v databáze."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        po_meno = json.dumps(spolocnost.po_obchodne_meno, ensure_ascii=False)
-        
-        cursor.execute("""
-            INSERT INTO spolocnosti (
-                dic, fo, po, zahranicna, datum_narodenia,
-                fo_priezvisko, fo_meno, fo_titul, fo_titul_za, fo_obchodne_meno,
-                po_obchodne_meno,
-                sidlo_ulica, sidlo_cislo, sidlo_psc, sidlo_obec, sidlo_stat,
-                sidlo_telefon, sidlo_email,
-                org_ulica, org_cislo, org_psc, org_obec, org_telefon, org_email
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(dic) DO UPDATE SET
-                fo = excluded.fo,
-                po = excluded.po,
-                zahranicna = excluded.zahranicna,
-                datum_narodenia = excluded.datum_narodenia,
-                fo_priezvisko = excluded.fo_priezvisko,
-                fo_meno = excluded.fo_meno,
-                fo_titul = excluded.fo_titul,
-                fo_titul_za = excluded.fo_titul_za,
-                fo_obchodne_meno = excluded.fo_obchodne_meno,
-                po_obchodne_meno = excluded.po_obchodne_meno,
-                sidlo_ulica = excluded.sidlo_ulica,
-                sidlo_cislo = excluded.sidlo_cislo,
-                sidlo_psc = excluded.sidlo_psc,
-                sidlo_obec = excluded.sidlo_obec,
-                sidlo_stat = excluded.sidlo_stat,
-                sidlo_telefon = excluded.sidlo_telefon,
-                sidlo_email = excluded.sidlo_email,
-                org_ulica = excluded.org_ulica,
-                org_cislo = excluded.org_cislo,
-                org_psc = excluded.org_psc,
-                org_obec = excluded.org_obec,
-                org_telefon = excluded.org_telefon,
-                org_email = excluded.org_email,
-                aktualizovane = CURRENT_TIMESTAMP
-        """, (
-            spolocnost.dic, int(spolocnost.fo), int(spolocnost.po), int(spolocnost.zahranicna),
-            spolocnost.datum_narodenia,
-            spolocnost.fo_priezvisko, spolocnost.fo_meno, spolocnost.fo_titul,
-            spolocnost.fo_titul_za, spolocnost.fo_obchodne_meno,
-            po_meno,
-            spolocnost.sidlo.ulica, spolocnost.sidlo.cislo, spolocnost.sidlo.psc,
-            spolocnost.sidlo.obec, spolocnost.sidlo.stat,
-            spolocnost.sidlo.telefon, spolocnost.sidlo.email_fax,
-            spolocnost.adresa_org_zlozky.ulica, spolocnost.adresa_org_zlozky.cislo,
-            spolocnost.adresa_org_zlozky.psc, spolocnost.adresa_org_zlozky.obec,
-            spolocnost.adresa_org_zlozky.telefon, spolocnost.adresa_org_zlozky.email_fax
-        ))
-        
-        conn.commit()
-        spolocnost_id = cursor.lastrowid or self.najdi_spolocnost_podla_dic(spolocnost.dic).id
-        conn.close()
+        with self.lock:
+            cursor = self.conn.cursor()
+            
+            # Riadky obchodného mena oddelené '\n' (ORDER BY triedi podľa mena, nie JSON literálu)
+            po_meno = "\n".join(spolocnost.po_obchodne_meno)
+            
+            cursor.execute(_SQL_UPSERT_SPOLOCNOST, (
+                spolocnost.dic, int(spolocnost.fo), int(spolocnost.po), int(spolocnost.zahranicna),
+                spolocnost.datum_narodenia,
+                spolocnost.fo_priezvisko, spolocnost.fo_meno, spolocnost.fo_titul,
+                spolocnost.fo_titul_za, spolocnost.fo_obchodne_meno,
+                po_meno,
+                spolocnost.sidlo.ulica, spolocnost.sidlo.cislo, spolocnost.sidlo.psc,
+                spolocnost.sidlo.obec, spolocnost.sidlo.stat,
+                spolocnost.sidlo.telefon, spolocnost.sidlo.email_fax,
+                spolocnost.adresa_org_zlozky.ulica, spolocnost.adresa_org_zlozky.cislo,
+                spolocnost.adresa_org_zlozky.psc, spolocnost.adresa_org_zlozky.obec,
+                spolocnost.adresa_org_zlozky.telefon, spolocnost.adresa_org_zlozky.email_fax
+            ))
+            
+            self._riadok_spolocnosti.cache_clear()
+            spolocnost_id = cursor.execute(_SQL_ID_SPOLOCNOSTI, (spolocnost.dic,)).fetchone()[0]
         
         return spolocnost_id
     
     def uloz_vozidlo(self, vozidlo: Vozidlo, spolocnost_id: int) -> int:
         """Uloží alebo aktualizuje vozidlo v databáze."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(_SQL_UPSERT_VOZIDLO, self._parametre_vozidla(vozidlo, spolocnost_id))
+            vozidlo_id = cursor.execute(_SQL_ID_VOZIDLA, (spolocnost_id, vozidlo.evc)).fetchone()[0]
         
-        cursor.execute("""
-            INSERT INTO vozidla (
-                spolocnost_id, evc, kategoria, objem_valcov, vykon_motora,
-                hmotnost, pocet_naprav, datum_prvej_evidencie,
-                hybrid, plyn, vodik
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(spolocnost_id, evc) DO UPDATE SET
-                kategoria = excluded.kategoria,
-                objem_valcov = excluded.objem_valcov,
-                vykon_motora = excluded.vykon_motora,
-                hmotnost = excluded.hmotnost,
-                pocet_naprav = excluded.pocet_naprav,
-                datum_prvej_evidencie = excluded.datum_prvej_evidencie,
-                hybrid = excluded.hybrid,
-                plyn = excluded.plyn,
-                vodik = excluded.vodik,
-                aktualizovane = CURRENT_TIMESTAMP
-        """, (
+        return vozidlo_id
+    
+    def uloz_vozidla_hromadne(self, vozidla: List[Vozidlo], spolocnost_id: int) -> int:
+        """Uloží viac vozidiel jedným executemany v jednej transakcii; vráti počet vozidiel."""
+        # Parametre po stĺpcoch (rovnaké poradie ako _parametre_vozidla), riadky skladá až zip
+        parametre = zip(
+            repeat(spolocnost_id, len(vozidla)),
+            [v.evc for v in vozidla],
+            [v.kategoria for v in vozidla],
+            [v.objem_valcov for v in vozidla],
+            [v.vykon_motora for v in vozidla],
+            [v.hmotnost for v in vozidla],
+            [v.pocet_naprav for v in vozidla],
+            [v.datum_prvej_evidencie for v in vozidla],
+            [int(v.hybrid) for v in vozidla],
+            [int(v.plyn) for v in vozidla],
+            [int(v.vodik) for v in vozidla],
+        )
+        with self.transaction() as conn:
+            conn.executemany(_SQL_UPSERT_VOZIDLO, parametre)
+        
+        return len(vozidla)
+    
+    @staticmethod
+    def _parametre_vozidla(vozidlo: Vozidlo, spolocnost_id: int) -> tuple:
+        """Parametre pre _SQL_UPSERT_VOZIDLO."""
+        return (
             spolocnost_id, vozidlo.evc, vozidlo.kategoria,
             vozidlo.objem_valcov, vozidlo.vykon_motora,
             vozidlo.hmotnost, vozidlo.pocet_naprav,
             vozidlo.datum_prvej_evidencie,
             int(vozidlo.hybrid), int(vozidlo.plyn), int(vozidlo.vodik)
-        ))
-        
-        conn.commit()
-        vozidlo_id = cursor.lastrowid
-        conn.close()
-        
-        return vozidlo_id
+        )
     
     def najdi_spolocnost_podla_dic(self, dic: str) -> Optional[Spolocnost]:
         """Nájde spoločnosť podľa DIČ."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM spolocnosti WHERE dic = ?", (dic,))
-        row = cursor.fetchone()
-        conn.close()
-        
+        # Načítanie aj uloženie do cache pod zámkom - súbežný zápis (cache_clear) nemôže
+        # prísť medzi ne a nechať v cache starý riadok
+        with self.lock:
+            row = self._riadok_spolocnosti(dic)
         if not row:
             return None
         
-        spolocnost = Spolocnost(
-            id=row[0],
-            dic=row[1],
-            fo=bool(row[2]),
-            po=bool(row[3]),
-            zahranicna=bool(row[4]),
-            datum_narodenia=row[5] or "",
-            fo_priezvisko=row[6] or "",
-            fo_meno=row[7] or "",
-            fo_titul=row[8] or "",
-            fo_titul_za=row[9] or "",
-            fo_obchodne_meno=row[10] or "",
-            po_obchodne_meno=json.loads(row[11]) if row[11] else [],
+        # Vždy nový objekt - volajúci ho môžu meniť bez vplyvu na cache
+        return self._row_to_spolocnost(row)
+    
+    def _nacitaj_riadok_spolocnosti(self, dic: str) -> Optional[sqlite3.Row]:
+        """Načíta riadok spoločnosti z DB (volá sa cez LRU cache _riadok_spolocnosti)."""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(_SQL_SPOLOCNOST_PODLA_DIC, (dic,))
+            return cursor.fetchone()
+    
+    @staticmethod
+    def _nacitaj_obchodne_meno(hodnota: Optional[str]) -> List[str]:
+        """Riadky obchodného mena z DB; staršie záznamy sú uložené ako JSON zoznam."""
+        if not hodnota:
+            return []
+        if hodnota.startswith('['):
+            try:
+                return json.loads(hodnota)
+            except ValueError:
+                pass
+        return hodnota.split("\n")
+    
+    @staticmethod
+    def _row_to_spolocnost(row) -> Spolocnost:
+        """Vytvorí Spolocnost z riadku so stĺpcami _SQL_STLPCE_SPOLOCNOSTI."""
+        return Spolocnost(
+            id=row['id'],
+            dic=row['dic'],
+            fo=bool(row['fo']),
+            po=bool(row['po']),
+            zahranicna=bool(row['zahranicna']),
+            datum_narodenia=row['datum_narodenia'] or "",
+            fo_priezvisko=row['fo_priezvisko'] or "",
+            fo_meno=row['fo_meno'] or "",
+            fo_titul=row['fo_titul'] or "",
+            fo_titul_za=row['fo_titul_za'] or "",
+            fo_obchodne_meno=row['fo_obchodne_meno'] or "",
+            po_obchodne_meno=Database._nacitaj_obchodne_meno(row['po_obchodne_meno']),
             sidlo=Adresa(
-                ulica=row[12] or "",
-                cislo=row[13] or "",
-                psc=row[14] or "",
-                obec=row[15] or "",
-                stat=row[16] or "Slovenská republika",
-                telefon=row[17] or "",
-                email_fax=row[18] or ""
+                ulica=row['sidlo_ulica'] or "",
+                cislo=row['sidlo_cislo'] or "",
+                psc=row['sidlo_psc'] or "",
+                obec=row['sidlo_obec'] or "",
+                stat=row['sidlo_stat'] or "Slovenská republika",
+                telefon=row['sidlo_telefon'] or "",
+                email_fax=row['sidlo_email'] or ""
             ),
             adresa_org_zlozky=Adresa(
-                ulica=row[19] or "",
-                cislo=row[20] or "",
-                psc=row[21] or "",
-                obec=row[22] or "",
-                telefon=row[23] or "",
-                email_fax=row[24] or ""
+                ulica=row['org_ulica'] or "",
+                cislo=row['org_cislo'] or "",
+                psc=row['org_psc'] or "",
+                obec=row['org_obec'] or "",
+                telefon=row['org_telefon'] or "",
+                email_fax=row['org_email'] or ""
             )
         )
-        
-        return spolocnost
     
     def najdi_vozidla_spolocnosti(self, spolocnost_id: int) -> List[Vozidlo]:
         """Nájde všetky vozidlá spoločnosti."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM vozidla WHERE spolocnost_id = ?", (spolocnost_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        with self.lock:
+            cursor = self.conn.cursor()
+            
+            cursor.execute(_SQL_VOZIDLA_SPOLOCNOSTI, (spolocnost_id,))
+            rows = cursor.fetchall()
         
         vozidla = []
         for row in rows:
             vozidlo = Vozidlo(
-                id=row[0],
-                spolocnost_id=row[1],
-                evc=row[2] or "",
-                kategoria=row[3] or "",
-                objem_valcov=row[4] or 0.0,
-                vykon_motora=row[5] or 0.0,
-                hmotnost=row[6] or 0.0,
-                pocet_naprav=row[7] or 0,
-                datum_prvej_evidencie=row[8] or "",
-                hybrid=bool(row[9]),
-                plyn=bool(row[10]),
-                vodik=bool(row[11])
+                id=row['id'],
+                spolocnost_id=row['spolocnost_id'],
+                evc=row['evc'] or "",
+                kategoria=row['kategoria'] or "",
+                objem_valcov=row['objem_valcov'] or 0.0,
+                vykon_motora=row['vykon_motora'] or 0.0,
+                hmotnost=row['hmotnost'] or 0.0,
+                pocet_naprav=row['pocet_naprav'] or 0,
+                datum_prvej_evidencie=row['datum_prvej_evidencie'] or "",
+                hybrid=bool(row['hybrid']),
+                plyn=bool(row['plyn']),
+                vodik=bool(row['vodik'])
             )
             vozidla.append(vozidlo)
         
@@ -982,23 +1497,66 @@ class Database:
     
     def zoznam_spolocnosti(self) -> List[Spolocnost]:
         """Vráti zoznam všetkých spoločností."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT dic FROM spolocnosti ORDER BY po_obchodne_meno")
-        rows = cursor.fetchall()
-        conn.close()
+        with self.lock:
+            cursor = self.conn.cursor()
+            
+            cursor.execute(_SQL_ZOZNAM_SPOLOCNOSTI)
+            rows = cursor.fetchall()
         
-        return [self.najdi_spolocnost_podla_dic(row[0]) for row in rows]
+        return [self._row_to_spolocnost(row) for row in rows]
 
 
 # =============================================================================
 # PDF EXTRACTOR
 # =============================================================================
 
+def _to_float(hodnota) -> Optional[float]:
+    """Prevedie bunku na float; prázdna bunka = 0.0, neplatná hodnota = None."""
+    m = _RE_FLOAT.fullmatch(str(hodnota or '0'))
+    return float(m.group(1).replace(',', '.')) if m else None
+
+
+def _to_int(hodnota) -> Optional[int]:
+    """Prevedie bunku na int; prázdna bunka = 0, neplatná hodnota = None."""
+    m = _RE_INT.fullmatch(str(hodnota or '0'))
+    return int(m.group(1)) if m else None
+
+
+# Indexy stĺpcov tabuľky vozidiel (poradie PDFExtractor.STLPCE_HLAVICKY)
+_STL_EVC, _STL_KATEGORIA, _STL_OBJEM, _STL_VYKON, _STL_HMOTNOST, _STL_NAPRAVY = range(6)
+
+
 class PDFExtractor:
     """Extraktor údajov z PDF dokumentov."""
     
+    POLIA_VOZIDLA = ('evc', 'kategoria', 'objem', 'vykon', 'hmotnost', 'datum')
+    # Kľúčové slovo alternatívneho pohonu -> príznak vozidla (r16)
+    PRIZNAKY_POHONU = {
+        'hybrid': 'hybrid',
+        'lpg': 'plyn', 'cng': 'plyn', 'plyn': 'plyn',
+        'vodík': 'vodik', 'h2': 'vodik',
+    }
+    # Kľúčové slová hlavičky tabuľky podľa priority stĺpca (pri viacerých zhodách vyhráva skorší);
+    # poradie zodpovedá indexom _STL_EVC ... _STL_NAPRAVY
+    STLPCE_HLAVICKY = (
+        ('evc', ('eč', 'spz', 'evidenčn')),
+        ('kategoria', ('kategór', 'druh')),
+        ('objem', ('objem', 'cm³')),
+        ('vykon', ('výkon', 'kw')),
+        ('hmotnost', ('hmotno', 'kg')),
+        ('napravy', ('náprav',)),
+    )
+    _RX_HLAVICKA = re.compile('|'.join(
+        f"(?P<{stlpec}>{'|'.join(map(re.escape, slova))})" for stlpec, slova in STLPCE_HLAVICKY
+    ))
+    _PRIORITA_STLPCA = {stlpec: i for i, (stlpec, _) in enumerate(STLPCE_HLAVICKY)}
+    # Príznaky kompilácie vzorov, ktoré nie sú len IGNORECASE
+    PRIZNAKY_VZOROV = {
+        'nazov_spolocnosti': re.IGNORECASE | re.DOTALL,
+        'datum': 0,
+        'psc_obec': 0,
+    }
+    
     def __init__(self):
         self.patterns = {
             'dic': r'DIČ[:\s]*(\d{10})',
@@ -1013,42 +1571,112 @@ class PDFExtractor:
             'ulica': r'(?:Ulica|Adresa)[:\s]*(.+?)(?:\n|\d{3}\s*\d{2})',
             'psc_obec': r'(\d{3}\s*\d{2})\s+(.+?)(?:\n|$)',
         }
+        self.compiled = {
+            k: re.compile(p, self.PRIZNAKY_VZOROV.get(k, re.IGNORECASE))
+            for k, p in self.patterns.items()
+        }
+        
+        # Polia vozidla v jednom vzore - text sa prejde iba raz (finditer + lastgroup)
+        self._rx_vozidlo = re.compile(
+            '|'.join(f'(?P<{k}>{self.patterns[k]})' for k in self.POLIA_VOZIDLA),
+            re.IGNORECASE
+        )
+        # Hodnota je vo vnorenej skupine hneď za pomenovanou skupinou poľa
+        self._skupina_hodnoty = {k: i + 1 for k, i in self._rx_vozidlo.groupindex.items()}
+        self._rx_pohon = re.compile('|'.join(self.PRIZNAKY_POHONU), re.IGNORECASE)
+        self._pocet_priznakov_pohonu = len(set(self.PRIZNAKY_POHONU.values()))
     
     def extrahuj_text_z_pdf(self, pdf_path: str) -> str:
-        """Extrahuje text z PDF súboru."""
-        text = ""
+        """Extrahuje text z PDF súboru; OCR sa spúšťa len pre strany bez textovej vrstvy."""
+        # Textová vrstva cez PDFium (bez layout analýzy); pdfplumber len ak nič nevráti
+        strany = self._extrahuj_strany_pdfium(pdf_path) if PDFIUM_AVAILABLE else []
+        if not any(t.strip() for t in strany):
+            strany = self._extrahuj_strany_pdfplumber(pdf_path)
+        
+        if OCR_AVAILABLE:
+            # PDF sa nepodarilo prečítať - OCR celého dokumentu
+            if not strany:
+                return self._extrahuj_text_ocr(pdf_path)
+            
+            # OCR len naskenovaných strán, ostatné ponechajú textovú vrstvu
+            prazdne = [i for i, t in enumerate(strany) if not t.strip()]
+            if prazdne:
+                for i, page_text in self._ocr_strany(pdf_path, prazdne).items():
+                    strany[i] = f"--- Strana {i+1} ---\n{page_text}"
+        
+        return "".join(f"{t}\n" for t in strany if t)
+    
+    def _extrahuj_strany_pdfplumber(self, pdf_path: str) -> List[str]:
+        """Text jednotlivých strán cez pdfplumber (prázdny reťazec pre stranu bez textu)."""
+        import pdfplumber
+        strany = []
         
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                    strany.append(page.extract_text() or "")
         except Exception as e:
             print(f"Chyba pri extrakcii textu z PDF: {e}")
         
-        # Ak sa nepodarilo extrahovať text, skús OCR
-        if not text.strip() and OCR_AVAILABLE:
-            text = self._extrahuj_text_ocr(pdf_path)
+        return strany
+    
+    def _extrahuj_strany_pdfium(self, pdf_path: str) -> List[str]:
+        """Text jednotlivých strán cez pypdfium2 (rovnaký formát ako pdfplumber)."""
+        strany = []
         
-        return text
+        try:
+            pdf = pypdfium2.PdfDocument(pdf_path)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    strany.append(textpage.get_text_range().replace('\r\n', '\n'))
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        except Exception as e:
+            print(f"Chyba pri extrakcii textu cez PDFium: {e}")
+        
+        return strany
+    
+    def _ocr_strany(self, pdf_path: str, indexy: List[int]) -> Dict[int, str]:
+        """OCR vybraných strán (index od 0); rasterizuje sa vždy len jedna strana."""
+        def ocr(i: int) -> str:
+            images = convert_from_path(pdf_path, first_page=i + 1, last_page=i + 1)
+            return self._ocr_strana(images[0]) if images else ""
+        
+        try:
+            with ThreadPoolExecutor(max_workers=min(len(indexy), os.cpu_count() or 1)) as executor:
+                return dict(zip(indexy, executor.map(ocr, indexy)))
+        except Exception as e:
+            print(f"Chyba pri OCR: {e}")
+            return {}
     
     def _extrahuj_text_ocr(self, pdf_path: str) -> str:
         """Extrahuje text z PDF pomocou OCR."""
-        text = ""
+        casti = []
         
         try:
             images = convert_from_path(pdf_path)
-            for i, image in enumerate(images):
-                page_text = pytesseract.image_to_string(image, lang='slk+ces')
-                text += f"--- Strana {i+1} ---\n{page_text}\n"
+            # Tesseract beží ako samostatný proces - stačia vlákna, strany sa OCR-ujú paralelne
+            # (OMP_THREAD_LIMIT pre súbežné procesy nastavuje main() / run_server())
+            with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1) or 1) as executor:
+                texty = executor.map(self._ocr_strana, images)
+                for i, page_text in enumerate(texty):
+                    casti.append(f"--- Strana {i+1} ---\n{page_text}\n")
         except Exception as e:
             print(f"Chyba pri OCR: {e}")
         
-        return text
+        return "".join(casti)
+    
+    @staticmethod
+    def _ocr_strana(image) -> str:
+        """OCR jednej strany (slovenčina + čeština)."""
+        return pytesseract.image_to_string(image, lang='slk+ces')
     
     def extrahuj_tabulky_z_pdf(self, pdf_path: str) -> List[List[List[str]]]:
         """Extrahuje tabuľky z PDF súboru."""
+        import pdfplumber
         tabulky = []
         
         try:
@@ -1067,12 +1695,12 @@ class PDFExtractor:
         spolocnost = Spolocnost()
         
         # DIČ
-        dic_match = re.search(self.patterns['dic'], text, re.IGNORECASE)
+        dic_match = self.compiled['dic'].search(text)
         if dic_match:
             spolocnost.dic = dic_match.group(1)
         
         # Názov spoločnosti
-        nazov_match = re.search(self.patterns['nazov_spolocnosti'], text, re.IGNORECASE | re.DOTALL)
+        nazov_match = self.compiled['nazov_spolocnosti'].search(text)
         if nazov_match:
             nazov = nazov_match.group(1).strip()
             # Rozdeľ na riadky ak je príliš dlhý
@@ -1083,11 +1711,11 @@ class PDFExtractor:
                 spolocnost.po_obchodne_meno = [nazov]
         
         # Adresa
-        ulica_match = re.search(self.patterns['ulica'], text, re.IGNORECASE)
+        ulica_match = self.compiled['ulica'].search(text)
         if ulica_match:
             spolocnost.sidlo.ulica = ulica_match.group(1).strip()
         
-        psc_obec_match = re.search(self.patterns['psc_obec'], text)
+        psc_obec_match = self.compiled['psc_obec'].search(text)
         if psc_obec_match:
             spolocnost.sidlo.psc = psc_obec_match.group(1).replace(' ', '')
             spolocnost.sidlo.obec = psc_obec_match.group(2).strip()
@@ -1098,47 +1726,64 @@ class PDFExtractor:
         """Parsuje údaje o vozidle z textu."""
         vozidlo = Vozidlo()
         
+        # Prvý výskyt každého poľa v jednom prechode textom
+        hodnoty = {}
+        for m in self._rx_vozidlo.finditer(text):
+            pole = m.lastgroup
+            if pole not in hodnoty:
+                hodnoty[pole] = m.group(self._skupina_hodnoty[pole])
+                if len(hodnoty) == len(self.POLIA_VOZIDLA):
+                    break
+        
         # EČV
-        evc_match = re.search(self.patterns['evc'], text, re.IGNORECASE)
-        if evc_match:
-            vozidlo.evc = evc_match.group(1).replace(' ', '')
+        if 'evc' in hodnoty:
+            vozidlo.evc = hodnoty['evc'].replace(' ', '')
         
         # Kategória
-        kat_match = re.search(self.patterns['kategoria'], text, re.IGNORECASE)
-        if kat_match:
-            vozidlo.kategoria = kat_match.group(1).upper()
+        if 'kategoria' in hodnoty:
+            vozidlo.kategoria = hodnoty['kategoria'].upper()
         
         # Objem valcov
-        objem_match = re.search(self.patterns['objem'], text, re.IGNORECASE)
-        if objem_match:
-            vozidlo.objem_valcov = float(objem_match.group(1).replace(',', '.'))
+        if 'objem' in hodnoty:
+            vozidlo.objem_valcov = float(hodnoty['objem'].replace(',', '.'))
         
         # Výkon motora
-        vykon_match = re.search(self.patterns['vykon'], text, re.IGNORECASE)
-        if vykon_match:
-            vozidlo.vykon_motora = float(vykon_match.group(1).replace(',', '.'))
+        if 'vykon' in hodnoty:
+            vozidlo.vykon_motora = float(hodnoty['vykon'].replace(',', '.'))
         
         # Hmotnosť
-        hmotnost_match = re.search(self.patterns['hmotnost'], text, re.IGNORECASE)
-        if hmotnost_match:
-            vozidlo.hmotnost = float(hmotnost_match.group(1).replace(',', '.'))
+        if 'hmotnost' in hodnoty:
+            vozidlo.hmotnost = float(hodnoty['hmotnost'].replace(',', '.'))
         
         # Dátum prvej evidencie
-        datumy = re.findall(self.patterns['datum'], text)
-        if datumy:
-            vozidlo.datum_prvej_evidencie = datumy[0].replace('/', '.')
-        
-        # Detekcia alternatívneho pohonu
-        text_lower = text.lower()
-        if 'hybrid' in text_lower:
-            vozidlo.hybrid = True
-        if any(x in text_lower for x in ['lpg', 'cng', 'plyn']):
-            vozidlo.plyn = True
-        if 'vodík' in text_lower or 'h2' in text_lower:
-            vozidlo.vodik = True
+        if 'datum' in hodnoty:
+            vozidlo.datum_prvej_evidencie = hodnoty['datum'].replace('/', '.')
+        
+        # Detekcia alternatívneho pohonu - jeden prechod, koniec keď sú nájdené všetky príznaky
+        priznaky = set()
+        for m in self._rx_pohon.finditer(text):
+            priznaky.add(self.PRIZNAKY_POHONU[m.group(0).lower()])
+            if len(priznaky) == self._pocet_priznakov_pohonu:
+                break
+        for priznak in priznaky:
+            setattr(vozidlo, priznak, True)
         
         return vozidlo
     
+    def _stlpec_hlavicky(self, h: str) -> int:
+        """
+        Určí stĺpec podľa bunky hlavičky jedným prechodom regexu (najvyššia priorita vyhráva).
+        Vráti index do STLPCE_HLAVICKY (_STL_EVC ... _STL_NAPRAVY) alebo -1.
+        """
+        najlepsi = -1
+        for m in self._RX_HLAVICKA.finditer(h):
+            priorita = self._PRIORITA_STLPCA[m.lastgroup]
+            if najlepsi < 0 or priorita < najlepsi:
+                najlepsi = priorita
+                if priorita == 0:
+                    break
+        return najlepsi
+    
     def parsuj_vozidla_z_tabulky(self, tabulky: List[List[List[str]]]) -> List[Vozidlo]:
         """Parsuje vozidlá z tabuľkových údajov."""
         vozidla = []
@@ -1150,21 +1795,15 @@ class PDFExtractor:
             # Nájdi hlavičku
             hlavicka = [str(h).lower() if h else '' for h in tabulka[0]]
             
-            # Mapovanie stĺpcov
-            col_map = {}
+            # Mapovanie stĺpcov: col_idx[_STL_*] = index stĺpca v tabuľke, -1 = chýba
+            col_idx = [-1] * len(self.STLPCE_HLAVICKY)
             for i, h in enumerate(hlavicka):
-                if 'eč' in h or 'spz' in h or 'evidenčn' in h:
-                    col_map['evc'] = i
-                elif 'kategór' in h or 'druh' in h:
-                    col_map['kategoria'] = i
-                elif 'objem' in h or 'cm³' in h:
-                    col_map['objem'] = i
-                elif 'výkon' in h or 'kw' in h:
-                    col_map['vykon'] = i
-                elif 'hmotno' in h or 'kg' in h:
-                    col_map['hmotnost'] = i
-                elif 'náprav' in h:
-                    col_map['napravy'] = i
+                stlpec = self._stlpec_hlavicky(h)
+                if stlpec >= 0:
+                    col_idx[stlpec] = i
+            i_evc, i_kat = col_idx[_STL_EVC], col_idx[_STL_KATEGORIA]
+            i_objem, i_vykon = col_idx[_STL_OBJEM], col_idx[_STL_VYKON]
+            i_hmot, i_naprav = col_idx[_STL_HMOTNOST], col_idx[_STL_NAPRAVY]
             
             # Parsuj riadky
             for riadok in tabulka[1:]:
@@ -1172,36 +1811,34 @@ class PDFExtractor:
                     continue
                 
                 vozidlo = Vozidlo()
+                n = len(riadok)
                 
-                if 'evc' in col_map and col_map['evc'] < len(riadok):
-                    vozidlo.evc = str(riadok[col_map['evc']] or '').replace(' ', '')
+                if 0 <= i_evc < n:
+                    vozidlo.evc = str(riadok[i_evc] or '').replace(' ', '')
                 
-                if 'kategoria' in col_map and col_map['kategoria'] < len(riadok):
-                    vozidlo.kategoria = str(riadok[col_map['kategoria']] or '').upper()
+                if 0 <= i_kat < n:
+                    vozidlo.kategoria = str(riadok[i_kat] or '').upper()
                 
-                if 'objem' in col_map and col_map['objem'] < len(riadok):
-                    try:
-                        vozidlo.objem_valcov = float(str(riadok[col_map['objem']] or '0').replace(',', '.'))
-                    except ValueError:
-                        pass
+                # Neplatné čísla (None) ponechajú predvolenú hodnotu
+                if 0 <= i_objem < n:
+                    hodnota = _to_float(riadok[i_objem])
+                    if hodnota is not None:
+                        vozidlo.objem_valcov = hodnota
                 
-                if 'vykon' in col_map and col_map['vykon'] < len(riadok):
-                    try:
-                        vozidlo.vykon_motora = float(str(riadok[col_map['vykon']] or '0').replace(',', '.'))
-                    except ValueError:
-                        pass
+                if 0 <= i_vykon < n:
+                    hodnota = _to_float(riadok[i_vykon])
+                    if hodnota is not None:
+                        vozidlo.vykon_motora = hodnota
                 
-                if 'hmotnost' in col_map and col_map['hmotnost'] < len(riadok):
-                    try:
-                        vozidlo.hmotnost = float(str(riadok[col_map['hmotnost']] or '0').replace(',', '.'))
-                    except ValueError:
-                        pass
+                if 0 <= i_hmot < n:
+                    hodnota = _to_float(riadok[i_hmot])
+                    if hodnota is not None:
+                        vozidlo.hmotnost = hodnota
                 
-                if 'napravy' in col_map and col_map['napravy'] < len(riadok):
-                    try:
-                        vozidlo.pocet_naprav = int(str(riadok[col_map['napravy']] or '0'))
-                    except ValueError:
-                        pass
+                if 0 <= i_naprav < n:
+                    hodnota = _to_int(riadok[i_naprav])
+                    if hodnota is not None:
+                        vozidlo.pocet_naprav = hodnota
                 
                 if vozidlo.evc:
                     vozidla.append(vozidlo)
@@ -1213,292 +1850,370 @@ class PDFExtractor:
 # XML GENERATOR
 # =============================================================================
 
+# Predvolená XSD schéma vedľa skriptu; skompilované schémy sa držia v pamäti podľa cesty
+_XSD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dmv2025.xsd')
+_XSD_SCHEMY: Dict[str, Tuple[int, etree.XMLSchema]] = {}
+
+
+def _nacitaj_xsd_schemu(xsd_path: str) -> etree.XMLSchema:
+    """Vráti skompilovanú XSD schému; znovu ju načíta len ak sa súbor zmenil."""
+    cesta = os.path.abspath(xsd_path)
+    zmenene = os.stat(cesta).st_mtime_ns
+    zaznam = _XSD_SCHEMY.get(cesta)
+    if zaznam is None or zaznam[0] != zmenene:
+        zaznam = (zmenene, etree.XMLSchema(etree.parse(cesta)))
+        _XSD_SCHEMY[cesta] = zaznam
+    return zaznam[1]
+
+
+def _xml_bool(value) -> str:
+    """Konvertuje bool na '0' alebo '1'."""
+    return '1' if value else '0'
+
+
+def _xml_cislo(value) -> str:
+    """Konvertuje číslo na string (nula a None ako prázdny text)."""
+    return str(value) if value else ''
+
+
+def _riadok_obchodneho_mena(i: int):
+    """Getter i-teho riadku obchodného mena PO (chýbajúci riadok je prázdny)."""
+    def getter(priznanie):
+        mena = priznanie.spolocnost.po_obchodne_meno or ['']
+        return mena[i] if i < len(mena) else ''
+    return getter
+
+
+# Tabuľky polí XML: pole (tag, getter, konvertor), vnorený element (tag, (deti...))
+_HLAVICKA_POLIA = (
+    # Typ osoby
+    ('fo', attrgetter('spolocnost.fo'), _xml_bool),
+    ('po', attrgetter('spolocnost.po'), _xml_bool),
+    ('zahranicna', attrgetter('spolocnost.zahranicna'), _xml_bool),
+    # Identifikácia
+    ('dic', attrgetter('spolocnost.dic'), None),
+    ('datumNarodenia', attrgetter('spolocnost.datum_narodenia'), None),
+    # Typ daňového priznania
+    ('typDP', (
+        ('rdp', attrgetter('rdp'), _xml_bool),
+        ('odp', attrgetter('odp'), _xml_bool),
+        ('ddp', attrgetter('ddp'), _xml_bool),
+    )),
+    # Zdaňovacie obdobie
+    ('zdanovacieObdobie', (
+        ('od', attrgetter('obdobie_od'), None),
+        ('do', attrgetter('obdobie_do'), None),
+        ('datumDDP', attrgetter('datum_ddp'), None),
+    )),
+    # Obdobie podľa § 9
+    ('ObdobiePar9', (
+        ('ods1', attrgetter('par9_ods1'), _xml_bool),
+        ('ods3', attrgetter('par9_ods3'), _xml_bool),
+        ('ods4', attrgetter('par9_ods4'), _xml_bool),
+        ('ods5', attrgetter('par9_ods5'), _xml_bool),
+        ('ods6', attrgetter('par9_ods6'), _xml_bool),
+        ('ods7', attrgetter('par9_ods7'), _xml_bool),
+    )),
+    # Údaje FO
+    ('foPriezvisko', attrgetter('spolocnost.fo_priezvisko'), None),
+    ('foMeno', attrgetter('spolocnost.fo_meno'), None),
+    ('foTitul', attrgetter('spolocnost.fo_titul'), None),
+    ('foTitulZa', attrgetter('spolocnost.fo_titul_za'), None),
+    ('foObchodneMeno', attrgetter('spolocnost.fo_obchodne_meno'), None),
+    # Obchodné meno PO
+    ('poObchodneMeno', tuple(('riadok', _riadok_obchodneho_mena(i), None) for i in range(4))),
+    # Sídlo
+    ('sidlo', (
+        ('ulica', attrgetter('spolocnost.sidlo.ulica'), None),
+        ('cislo', attrgetter('spolocnost.sidlo.cislo'), None),
+        ('psc', attrgetter('spolocnost.sidlo.psc'), None),
+        ('obec', attrgetter('spolocnost.sidlo.obec'), None),
+        ('stat', attrgetter('spolocnost.sidlo.stat'), None),
+        ('telefon', attrgetter('spolocnost.sidlo.telefon'), None),
+        ('emailFax', attrgetter('spolocnost.sidlo.email_fax'), None),
+    )),
+    # Adresa organizačnej zložky
+    ('adresaOrganizacnejZlozky', (
+        ('ulica', attrgetter('spolocnost.adresa_org_zlozky.ulica'), None),
+        ('cislo', attrgetter('spolocnost.adresa_org_zlozky.cislo'), None),
+        ('psc', attrgetter('spolocnost.adresa_org_zlozky.psc'), None),
+        ('obec', attrgetter('spolocnost.adresa_org_zlozky.obec'), None),
+        ('telefon', attrgetter('spolocnost.adresa_org_zlozky.telefon'), None),
+        ('emailFax', attrgetter('spolocnost.adresa_org_zlozky.email_fax'), None),
+    )),
+    # Typ zástupcu
+    ('typZastupcu', (
+        ('typZastupca', attrgetter('typ_zastupcu_zastupca'), _xml_bool),
+        ('dedic', attrgetter('typ_zastupcu_dedic'), _xml_bool),
+        ('spravcaVkonkurznomKonani', attrgetter('typ_zastupcu_spravca'), _xml_bool),
+        ('likvidator', attrgetter('typ_zastupcu_likvidator'), _xml_bool),
+        ('statutarnyZastupcaPO', attrgetter('typ_zastupcu_statutar'), _xml_bool),
+        ('pravnyNastupca', attrgetter('typ_zastupcu_pravny_nastupca'), _xml_bool),
+    )),
+    # Zástupca
+    ('zastupca', (
+        ('priezvisko', attrgetter('zastupca_priezvisko'), None),
+        ('meno', attrgetter('zastupca_meno'), None),
+        ('titul', attrgetter('zastupca_titul'), None),
+        ('titulZa', attrgetter('zastupca_titul_za'), None),
+        ('rc', attrgetter('zastupca_rc'), None),
+        ('datumNarodenia', attrgetter('zastupca_datum_narodenia'), None),
+        ('dic', attrgetter('zastupca_dic'), None),
+        ('obchodneMeno', attrgetter('zastupca_obchodne_meno'), None),
+        # Adresa zástupcu
+        ('adresa', (
+            ('ulica', attrgetter('zastupca_adresa.ulica'), None),
+            ('cislo', attrgetter('zastupca_adresa.cislo'), None),
+            ('psc', attrgetter('zastupca_adresa.psc'), None),
+            ('obec', attrgetter('zastupca_adresa.obec'), None),
+            ('stat', attrgetter('zastupca_adresa.stat'), None),
+            ('telefon', attrgetter('zastupca_adresa.telefon'), None),
+            ('emailFax', attrgetter('zastupca_adresa.email_fax'), None),
+        )),
+    )),
+)
+
+_TELO_POLIA = (
+    # Súhrnné údaje
+    ('r35', attrgetter('r35_pocet_vozidiel'), _xml_cislo),
+    ('r36', attrgetter('r36_dan_spolu'), _xml_cislo),
+    ('r37', attrgetter('r37_oslobodenie'), _xml_cislo),
+    ('r38', attrgetter('r38_dan_po_oslobodeni'), _xml_cislo),
+    ('r39', attrgetter('r39_zaplatene_preddavky'), _xml_cislo),
+    ('r40', attrgetter('r40_dan_na_uhradu'), _xml_cislo),
+    ('r41', attrgetter('r41_preddavky_stvrrocne'), _xml_cislo),
+    ('r42', attrgetter('r42_preddavky_mesacne'), _xml_cislo),
+    ('r43', attrgetter('r43_suma_stvrrocne'), _xml_cislo),
+    ('r44', attrgetter('r44_suma_mesacne'), _xml_cislo),
+    ('r45', attrgetter('r45_preplatok'), _xml_cislo),
+    # Vrátenie preplatku
+    ('vrateniePreplatku', (
+        ('vratit', attrgetter('vratit_preplatok'), _xml_bool),
+        ('sposobPlatby', (
+            ('poukazka', attrgetter('sposob_platby_poukazka'), _xml_bool),
+            ('ucet', attrgetter('sposob_platby_ucet'), _xml_bool),
+        )),
+        ('IBAN', attrgetter('iban'), None),
+        ('datum', attrgetter('datum_vratenia'), None),
+    )),
+    # Poznámky a dátum vyhlásenia
+    ('poznamky', attrgetter('poznamky'), None),
+    ('datumVyhlasenia', attrgetter('datum_vyhlasenia'), None),
+)
+
+_STLPEC_POLIA = (
+    ('r01', attrgetter('datum_prvej_evidencie'), None),
+    ('r02vzniku', attrgetter('datum_vzniku_povinnosti'), None),
+    ('r02zaniku', attrgetter('datum_zaniku_povinnosti'), None),
+    ('r03Kategoria', attrgetter('kategoria'), None),
+    ('r04KodDruhuBA-BB', attrgetter('kod_druhu_ba_bb'), _xml_bool),
+    ('r04KodDruhuBC-BD', attrgetter('kod_druhu_bc_bd'), _xml_bool),
+    ('r05VzduchovePruzenie', attrgetter('vzduchove_pruzenie'), _xml_bool),
+    ('r05IneSystemy', attrgetter('ine_systemy'), _xml_bool),
+    ('r06-EVC', attrgetter('evc'), None),
+    ('r07-ObjemValcov', attrgetter('objem_valcov'), _xml_cislo),
+    ('r08-VykonMotora', attrgetter('vykon_motora'), _xml_cislo),
+    ('r09Hmotnost', attrgetter('hmotnost'), _xml_cislo),
+    ('r10PocetNaprav', attrgetter('pocet_naprav'), _xml_cislo),
+    ('r11pism', attrgetter('r11_pismeno'), None),
+    ('r12pism', attrgetter('r12_pismeno'), None),
+    ('r12oslobodene', attrgetter('r12_oslobodene'), _xml_bool),
+    ('r13sadzba', attrgetter('sadzba'), _xml_cislo),
+    # Zvýšenie/zníženie sadzby - stĺpec 1 a 2 (bity masiek zvysenie_1 / zvysenie_2)
+    *((f'r14zvysenieSadzby{stlpec}_{percento}', attrgetter(f'zvysenie_{stlpec}_{percento}'), _xml_bool)
+      for stlpec in (1, 2) for percento, _ in ZVYSENIA),
+    # Ročné sadzby
+    ('r15rocnaSadzba_1', attrgetter('rocna_sadzba_1'), _xml_cislo),
+    ('r15rocnaSadzba_2', attrgetter('rocna_sadzba_2'), _xml_cislo),
+    # Ekologické zníženie
+    ('r16hybrid', attrgetter('hybrid'), _xml_bool),
+    ('r16plyn', attrgetter('plyn'), _xml_bool),
+    ('r16vodik', attrgetter('vodik'), _xml_bool),
+    # Sadzby po znížení
+    ('r17sadzba1', attrgetter('sadzba_po_znizeni_1'), _xml_cislo),
+    ('r17sadzba2', attrgetter('sadzba_po_znizeni_2'), _xml_cislo),
+    # Kombinovaná doprava
+    ('r18KombiDoprava', attrgetter('kombi_doprava'), _xml_bool),
+    # Sadzby pre kombi
+    ('r19sadzba1', attrgetter('sadzba_kombi_1'), _xml_cislo),
+    ('r19sadzba2', attrgetter('sadzba_kombi_2'), _xml_cislo),
+    # Počet mesiacov a dní
+    ('r20aPocMesS1', attrgetter('pocet_mesiacov_1'), _xml_cislo),
+    ('r20aPocMesS2', attrgetter('pocet_mesiacov_2'), _xml_cislo),
+    ('r20bPocDniS1', attrgetter('pocet_dni_1'), _xml_cislo),
+    ('r20bPocDniS2', attrgetter('pocet_dni_2'), _xml_cislo),
+    # Daň
+    ('r21dan1', attrgetter('dan_1'), _xml_cislo),
+    ('r21dan2', attrgetter('dan_2'), _xml_cislo),
+    # Sumarizácia
+    ('r22', attrgetter('r22'), _xml_cislo),
+    ('r23', attrgetter('r23'), _xml_cislo),
+    ('r24', attrgetter('r24'), _xml_cislo),
+    ('r25', attrgetter('r25'), _xml_cislo),
+)
+
+
+def _vypis_polia(parent: etree.Element, polia: tuple, zdroj) -> None:
+    """Vytvorí pod parent elementy podľa tabuľky polí s hodnotami zo zdroja."""
+    SubElement = etree.SubElement
+    for pole in polia:
+        if len(pole) == 2:
+            _vypis_polia(SubElement(parent, pole[0]), pole[1], zdroj)
+            continue
+        tag, get, conv = pole
+        value = get(zdroj)
+        SubElement(parent, tag).text = conv(value) if conv else value
+
+
+_E = ElementMaker()
+
+
+def _kostra_poli(polia: tuple):
+    """Postaví prázdne elementy podľa tabuľky polí cez ElementMaker."""
+    for pole in polia:
+        yield _E(pole[0], *_kostra_poli(pole[1])) if len(pole) == 2 else _E(pole[0])
+
+
+def _listy_poli(polia: tuple):
+    """Dvojice (getter, konvertor) listových polí v poradí dokumentu."""
+    for pole in polia:
+        if len(pole) == 2:
+            yield from _listy_poli(pole[1])
+        else:
+            yield pole[1:]
+
+
+def _postav_sablonu(tag: str, polia: tuple) -> tuple:
+    """Vráti (šablóna elementu, zoznam (index v iter(), getter, konvertor)) pre tabuľku polí."""
+    sablona = _E(tag, *_kostra_poli(polia))
+    listy = [i for i, el in enumerate(sablona.iter()) if len(el) == 0]
+    setre = [(i, get, conv) for i, (get, conv) in zip(listy, _listy_poli(polia))]
+    return sablona, setre
+
+
 class XMLGenerator:
     """Generátor XML súborov pre finančnú správu SR."""
     
-    def __init__(self):
-        self.ns = "http://www.financnasprava.sk/form/dmv/2025"
-        self.nsmap = {None: self.ns, 'xsi': 'http://www.w3.org/2001/XMLSchema-instance'}
-    
-    def _bool_to_str(self, value: bool) -> str:
-        """Konvertuje bool na '0' alebo '1'."""
-        return '1' if value else '0'
+    # Prázdny stĺpec - emitor vozidlo len číta, jedna inštancia stačí pre všetky prázdne stĺpce
+    _PRAZDNE_VOZIDLO: ClassVar[Vozidlo] = Vozidlo()
     
-    def _num_to_str(self, value: float, allow_empty: bool = True) -> str:
-        """Konvertuje číslo na string."""
-        if allow_empty and (value == 0 or value is None):
-            return ''
-        return str(value)
+    def __init__(self):
+        # Kostra hlavičky sa postaví raz, pri generovaní sa len klonuje a doplnia sa texty
+        self._hlavicka_sablona, self._hlavicka_setre = _postav_sablonu('hlavicka', _HLAVICKA_POLIA)
+        # Rovnako kostra strany strana3 (označenie + dva stĺpce) - texty sa len priradia
+        self._strana_sablona = _E(
+            'strana3',
+            _E('oznacenie', _E('aktualna'), _E('celkovo')),
+            _E('stlpec1', *_kostra_poli(_STLPEC_POLIA)),
+            _E('stlpec2', *_kostra_poli(_STLPEC_POLIA)),
+        )
     
-    def _int_to_str(self, value: int, allow_empty: bool = True) -> str:
-        """Konvertuje int na string."""
-        if allow_empty and (value == 0 or value is None):
-            return ''
-        return str(value)
+    XML_DEKLARACIA = b'<?xml version="1.0" encoding="UTF-8"?>\n'
     
-    def generuj_xml(self, priznanie: DanovePriznanie) -> str:
-        """Generuje kompletný XML súbor pre daňové priznanie."""
+    def generuj_xml(self, priznanie: DanovePriznanie, pretty: bool = False) -> bytes:
+        """Generuje kompletný XML súbor pre daňové priznanie (UTF-8 bajty, odsadenie len na požiadanie)."""
         
         # Koreňový element
         dokument = etree.Element('dokument')
-        
-        # Hlavička
-        hlavicka = etree.SubElement(dokument, 'hlavicka')
-        
-        # Typ osoby
-        etree.SubElement(hlavicka, 'fo').text = self._bool_to_str(priznanie.spolocnost.fo)
-        etree.SubElement(hlavicka, 'po').text = self._bool_to_str(priznanie.spolocnost.po)
-        etree.SubElement(hlavicka, 'zahranicna').text = self._bool_to_str(priznanie.spolocnost.zahranicna)
-        
-        # Identifikácia
-        etree.SubElement(hlavicka, 'dic').text = priznanie.spolocnost.dic
-        etree.SubElement(hlavicka, 'datumNarodenia').text = priznanie.spolocnost.datum_narodenia
-        
-        # Typ daňového priznania
-        typ_dp = etree.SubElement(hlavicka, 'typDP')
-        etree.SubElement(typ_dp, 'rdp').text = self._bool_to_str(priznanie.rdp)
-        etree.SubElement(typ_dp, 'odp').text = self._bool_to_str(priznanie.odp)
-        etree.SubElement(typ_dp, 'ddp').text = self._bool_to_str(priznanie.ddp)
-        
-        # Zdaňovacie obdobie
-        obdobie = etree.SubElement(hlavicka, 'zdanovacieObdobie')
-        etree.SubElement(obdobie, 'od').text = priznanie.obdobie_od
-        etree.SubElement(obdobie, 'do').text = priznanie.obdobie_do
-        etree.SubElement(obdobie, 'datumDDP').text = priznanie.datum_ddp
-        
-        # Obdobie podľa § 9
-        par9 = etree.SubElement(hlavicka, 'ObdobiePar9')
-        etree.SubElement(par9, 'ods1').text = self._bool_to_str(priznanie.par9_ods1)
-        etree.SubElement(par9, 'ods3').text = self._bool_to_str(priznanie.par9_ods3)
-        etree.SubElement(par9, 'ods4').text = self._bool_to_str(priznanie.par9_ods4)
-        etree.SubElement(par9, 'ods5').text = self._bool_to_str(priznanie.par9_ods5)
-        etree.SubElement(par9, 'ods6').text = self._bool_to_str(priznanie.par9_ods6)
-        etree.SubElement(par9, 'ods7').text = self._bool_to_str(priznanie.par9_ods7)
-        
-        # Údaje FO
-        etree.SubElement(hlavicka, 'foPriezvisko').text = priznanie.spolocnost.fo_priezvisko
-        etree.SubElement(hlavicka, 'foMeno').text = priznanie.spolocnost.fo_meno
-        etree.SubElement(hlavicka, 'foTitul').text = priznanie.spolocnost.fo_titul
-        etree.SubElement(hlavicka, 'foTitulZa').text = priznanie.spolocnost.fo_titul_za
-        etree.SubElement(hlavicka, 'foObchodneMeno').text = priznanie.spolocnost.fo_obchodne_meno
-        
-        # Obchodné meno PO
-        po_meno = etree.SubElement(hlavicka, 'poObchodneMeno')
-        mena = priznanie.spolocnost.po_obchodne_meno or ['']
-        for i in range(4):
-            riadok = etree.SubElement(po_meno, 'riadok')
-            riadok.text = mena[i] if i < len(mena) else ''
-        
-        # Sídlo
-        sidlo = etree.SubElement(hlavicka, 'sidlo')
-        etree.SubElement(sidlo, 'ulica').text = priznanie.spolocnost.sidlo.ulica
-        etree.SubElement(sidlo, 'cislo').text = priznanie.spolocnost.sidlo.cislo
-        etree.SubElement(sidlo, 'psc').text = priznanie.spolocnost.sidlo.psc
-        etree.SubElement(sidlo, 'obec').text = priznanie.spolocnost.sidlo.obec
-        etree.SubElement(sidlo, 'stat').text = priznanie.spolocnost.sidlo.stat
-        etree.SubElement(sidlo, 'telefon').text = priznanie.spolocnost.sidlo.telefon
-        etree.SubElement(sidlo, 'emailFax').text = priznanie.spolocnost.sidlo.email_fax
-        
-        # Adresa organizačnej zložky
-        org = etree.SubElement(hlavicka, 'adresaOrganizacnejZlozky')
-        etree.SubElement(org, 'ulica').text = priznanie.spolocnost.adresa_org_zlozky.ulica
-        etree.SubElement(org, 'cislo').text = priznanie.spolocnost.adresa_org_zlozky.cislo
-        etree.SubElement(org, 'psc').text = priznanie.spolocnost.adresa_org_zlozky.psc
-        etree.SubElement(org, 'obec').text = priznanie.spolocnost.adresa_org_zlozky.obec
-        etree.SubElement(org, 'telefon').text = priznanie.spolocnost.adresa_org_zlozky.telefon
-        etree.SubElement(org, 'emailFax').text = priznanie.spolocnost.adresa_org_zlozky.email_fax
-        
-        # Typ zástupcu
-        typ_zast = etree.SubElement(hlavicka, 'typZastupcu')
-        etree.SubElement(typ_zast, 'typZastupca').text = self._bool_to_str(priznanie.typ_zastupcu_zastupca)
-        etree.SubElement(typ_zast, 'dedic').text = self._bool_to_str(priznanie.typ_zastupcu_dedic)
-        etree.SubElement(typ_zast, 'spravcaVkonkurznomKonani').text = self._bool_to_str(priznanie.typ_zastupcu_spravca)
-        etree.SubElement(typ_zast, 'likvidator').text = self._bool_to_str(priznanie.typ_zastupcu_likvidator)
-        etree.SubElement(typ_zast, 'statutarnyZastupcaPO').text = self._bool_to_str(priznanie.typ_zastupcu_statutar)
-        etree.SubElement(typ_zast, 'pravnyNastupca').text = self._bool_to_str(priznanie.typ_zastupcu_pravny_nastupca)
-        
-        # Zástupca
-        zastupca = etree.SubElement(hlavicka, 'zastupca')
-        etree.SubElement(zastupca, 'priezvisko').text = priznanie.zastupca_priezvisko
-        etree.SubElement(zastupca, 'meno').text = priznanie.zastupca_meno
-        etree.SubElement(zastupca, 'titul').text = priznanie.zastupca_titul
-        etree.SubElement(zastupca, 'titulZa').text = priznanie.zastupca_titul_za
-        etree.SubElement(zastupca, 'rc').text = priznanie.zastupca_rc
-        etree.SubElement(zastupca, 'datumNarodenia').text = priznanie.zastupca_datum_narodenia
-        etree.SubElement(zastupca, 'dic').text = priznanie.zastupca_dic
-        etree.SubElement(zastupca, 'obchodneMeno').text = priznanie.zastupca_obchodne_meno
-        
-        # Adresa zástupcu
-        zast_adr = etree.SubElement(zastupca, 'adresa')
-        etree.SubElement(zast_adr, 'ulica').text = priznanie.zastupca_adresa.ulica
-        etree.SubElement(zast_adr, 'cislo').text = priznanie.zastupca_adresa.cislo
-        etree.SubElement(zast_adr, 'psc').text = priznanie.zastupca_adresa.psc
-        etree.SubElement(zast_adr, 'obec').text = priznanie.zastupca_adresa.obec
-        etree.SubElement(zast_adr, 'stat').text = priznanie.zastupca_adresa.stat
-        etree.SubElement(zast_adr, 'telefon').text = priznanie.zastupca_adresa.telefon
-        etree.SubElement(zast_adr, 'emailFax').text = priznanie.zastupca_adresa.email_fax
+        dokument.append(self._generuj_hlavicku(priznanie))
         
         # Telo dokumentu
         telo = etree.SubElement(dokument, 'telo')
+        self._generuj_suhrn_tela(telo, priznanie)
+        for strana in self._generuj_strany(priznanie):
+            telo.append(strana)
         
-        # Súhrnné údaje
-        etree.SubElement(telo, 'r35').text = self._int_to_str(priznanie.r35_pocet_vozidiel)
-        etree.SubElement(telo, 'r36').text = self._num_to_str(priznanie.r36_dan_spolu)
-        etree.SubElement(telo, 'r37').text = self._num_to_str(priznanie.r37_oslobodenie)
-        etree.SubElement(telo, 'r38').text = self._num_to_str(priznanie.r38_dan_po_oslobodeni)
-        etree.SubElement(telo, 'r39').text = self._num_to_str(priznanie.r39_zaplatene_preddavky)
-        etree.SubElement(telo, 'r40').text = self._num_to_str(priznanie.r40_dan_na_uhradu)
-        etree.SubElement(telo, 'r41').text = self._int_to_str(priznanie.r41_preddavky_stvrrocne)
-        etree.SubElement(telo, 'r42').text = self._int_to_str(priznanie.r42_preddavky_mesacne)
-        etree.SubElement(telo, 'r43').text = self._num_to_str(priznanie.r43_suma_stvrrocne)
-        etree.SubElement(telo, 'r44').text = self._num_to_str(priznanie.r44_suma_mesacne)
-        etree.SubElement(telo, 'r45').text = self._int_to_str(priznanie.r45_preplatok)
-        
-        # Vrátenie preplatku
-        vrat = etree.SubElement(telo, 'vrateniePreplatku')
-        etree.SubElement(vrat, 'vratit').text = self._bool_to_str(priznanie.vratit_preplatok)
-        sposob = etree.SubElement(vrat, 'sposobPlatby')
-        etree.SubElement(sposob, 'poukazka').text = self._bool_to_str(priznanie.sposob_platby_poukazka)
-        etree.SubElement(sposob, 'ucet').text = self._bool_to_str(priznanie.sposob_platby_ucet)
-        etree.SubElement(vrat, 'IBAN').text = priznanie.iban
-        etree.SubElement(vrat, 'datum').text = priznanie.datum_vratenia
-        
-        # Poznámky a dátum vyhlásenia
-        etree.SubElement(telo, 'poznamky').text = priznanie.poznamky
-        etree.SubElement(telo, 'datumVyhlasenia').text = priznanie.datum_vyhlasenia
-        
+        # Serializuj priamo do UTF-8 (bez medzikroku cez str) a pridaj XML deklaráciu
+        return self.XML_DEKLARACIA + etree.tostring(dokument, encoding='UTF-8', pretty_print=pretty)
+    
+    def generuj_xml_stream(self, priznanie: DanovePriznanie, output_path: str) -> str:
+        """
+        Zapíše XML priznania priamo do súboru cez etree.xmlfile.
+        Strany s vozidlami sa zapisujú a uvoľňujú postupne, celý strom nie je v pamäti.
+        """
+        # Deklarácia s dvojitými úvodzovkami ako v generuj_xml (write_declaration píše apostrofy)
+        with open(output_path, 'wb') as f, etree.xmlfile(f, encoding='UTF-8') as xf:
+            f.write(self.XML_DEKLARACIA)
+            with xf.element('dokument'):
+                xf.write('\n')
+                xf.write(self._generuj_hlavicku(priznanie), pretty_print=True)
+                with xf.element('telo'):
+                    xf.write('\n')
+                    # Súhrnné údaje sú malé - zapíšu sa ako deti dočasného tela
+                    telo = etree.Element('telo')
+                    self._generuj_suhrn_tela(telo, priznanie)
+                    for element in telo:
+                        xf.write(element, pretty_print=True)
+                    for strana in self._generuj_strany(priznanie):
+                        xf.write(strana, pretty_print=True)
+                        xf.flush()
+                xf.write('\n')
+        return output_path
+    
+    def _generuj_hlavicku(self, priznanie: DanovePriznanie) -> etree.Element:
+        """Generuje element hlavicka (údaje o daňovníkovi a zástupcovi)."""
+        hlavicka = copy.deepcopy(self._hlavicka_sablona)
+        prvky = list(hlavicka.iter())
+        for i, get, conv in self._hlavicka_setre:
+            value = get(priznanie)
+            prvky[i].text = conv(value) if conv else value
+        return hlavicka
+    
+    def _generuj_suhrn_tela(self, telo: etree.Element, priznanie: DanovePriznanie) -> None:
+        """Doplní do tela súhrnné riadky r35-r45, vrátenie preplatku a vyhlásenie."""
+        _vypis_polia(telo, _TELO_POLIA, priznanie)
+    
+    def _generuj_strany(self, priznanie: DanovePriznanie):
+        """Postupne generuje elementy strana3, každý s dvomi stĺpcami vozidiel."""
         # Strany s vozidlami (strana3)
-        # Každá strana obsahuje 2 vozidlá (stĺpec1 a stĺpec2)
-        celkovy_pocet = len(priznanie.vozidla)
-        pocet_stran = (celkovy_pocet + 1) // 2  # Zaokrúhli nahor
-        
-        if pocet_stran == 0:
-            pocet_stran = 1  # Minimálne 1 strana
-        
-        for i in range(pocet_stran):
-            strana = etree.SubElement(telo, 'strana3')
+        # Každá strana obsahuje 2 vozidlá (stĺpec1 a stĺpec2), nepárne vozidlo dostane prázdny stĺpec2
+        vozidla = priznanie.vozidla
+        dvojice = list(zip_longest(vozidla[0::2], vozidla[1::2])) or [(None, None)]  # Minimálne 1 strana
+        celkovo = str(len(dvojice))  # Rovnaké pre všetky strany - prevedie sa raz
+        
+        sablona = self._strana_sablona
+        for i, (vozidlo1, vozidlo2) in enumerate(dvojice, start=1):
+            # Klon kostry - všetky elementy strany vzniknú jedným volaním, ostáva len priradiť texty
+            strana = copy.deepcopy(sablona)
+            oznacenie, stlpec1, stlpec2 = strana
             
             # Označenie strany
-            oznacenie = etree.SubElement(strana, 'oznacenie')
-            etree.SubElement(oznacenie, 'aktualna').text = str(i + 1)
-            etree.SubElement(oznacenie, 'celkovo').text = str(pocet_stran)
+            oznacenie[0].text = f'{i}'
+            oznacenie[1].text = celkovo
             
-            # Stĺpec 1 - vozidlo na pozícii 2*i
-            vozidlo1_idx = 2 * i
-            vozidlo1 = priznanie.vozidla[vozidlo1_idx] if vozidlo1_idx < len(priznanie.vozidla) else None
-            stlpec1 = self._generuj_stlpec_vozidla(vozidlo1)
-            strana.append(stlpec1)
-            stlpec1.tag = 'stlpec1'
+            self._vypln_stlpec_vozidla(stlpec1, vozidlo1)
+            self._vypln_stlpec_vozidla(stlpec2, vozidlo2)
             
-            # Stĺpec 2 - vozidlo na pozícii 2*i + 1
-            vozidlo2_idx = 2 * i + 1
-            vozidlo2 = priznanie.vozidla[vozidlo2_idx] if vozidlo2_idx < len(priznanie.vozidla) else None
-            stlpec2 = self._generuj_stlpec_vozidla(vozidlo2)
-            strana.append(stlpec2)
-            stlpec2.tag = 'stlpec2'
-        
-        # Generuj XML string
-        xml_str = etree.tostring(
-            dokument,
-            encoding='unicode',
-            pretty_print=True
-        )
-        
-        # Pridaj XML deklaráciu
-        xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        
-        return xml_declaration + xml_str
+            yield strana
     
-    def _generuj_stlpec_vozidla(self, vozidlo: Optional[Vozidlo]) -> etree.Element:
-        """Generuje XML element pre stĺpec vozidla."""
-        stlpec = etree.Element('stlpec')
-        
+    def _vypln_stlpec_vozidla(self, stlpec: etree.Element, vozidlo: Optional[Vozidlo]) -> None:
+        """Doplní texty do prázdneho stĺpca vozidla (deti v poradí _STLPEC_POLIA)."""
         if vozidlo is None:
-            vozidlo = Vozidlo()  # Prázdne vozidlo
-        
-        etree.SubElement(stlpec, 'r01').text = vozidlo.datum_prvej_evidencie
-        etree.SubElement(stlpec, 'r02vzniku').text = vozidlo.datum_vzniku_povinnosti
-        etree.SubElement(stlpec, 'r02zaniku').text = vozidlo.datum_zaniku_povinnosti
-        etree.SubElement(stlpec, 'r03Kategoria').text = vozidlo.kategoria
-        etree.SubElement(stlpec, 'r04KodDruhuBA-BB').text = self._bool_to_str(vozidlo.kod_druhu_ba_bb)
-        etree.SubElement(stlpec, 'r04KodDruhuBC-BD').text = self._bool_to_str(vozidlo.kod_druhu_bc_bd)
-        etree.SubElement(stlpec, 'r05VzduchovePruzenie').text = self._bool_to_str(vozidlo.vzduchove_pruzenie)
-        etree.SubElement(stlpec, 'r05IneSystemy').text = self._bool_to_str(vozidlo.ine_systemy)
-        etree.SubElement(stlpec, 'r06-EVC').text = vozidlo.evc
-        etree.SubElement(stlpec, 'r07-ObjemValcov').text = self._num_to_str(vozidlo.objem_valcov)
-        etree.SubElement(stlpec, 'r08-VykonMotora').text = self._num_to_str(vozidlo.vykon_motora)
-        etree.SubElement(stlpec, 'r09Hmotnost').text = self._num_to_str(vozidlo.hmotnost)
-        etree.SubElement(stlpec, 'r10PocetNaprav').text = self._int_to_str(vozidlo.pocet_naprav)
-        etree.SubElement(stlpec, 'r11pism').text = vozidlo.r11_pismeno
-        etree.SubElement(stlpec, 'r12pism').text = vozidlo.r12_pismeno
-        etree.SubElement(stlpec, 'r12oslobodene').text = self._bool_to_str(vozidlo.r12_oslobodene)
-        etree.SubElement(stlpec, 'r13sadzba').text = self._int_to_str(vozidlo.sadzba)
-        
-        # Zvýšenie/zníženie sadzby - stĺpec 1
-        etree.SubElement(stlpec, 'r14zvysenieSadzby1_10').text = self._bool_to_str(vozidlo.zvysenie_1_10)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby1_20').text = self._bool_to_str(vozidlo.zvysenie_1_20)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby1_30').text = self._bool_to_str(vozidlo.zvysenie_1_30)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby1_40').text = self._bool_to_str(vozidlo.zvysenie_1_40)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby1_50').text = self._bool_to_str(vozidlo.zvysenie_1_50)
-        
-        # Zvýšenie/zníženie sadzby - stĺpec 2
-        etree.SubElement(stlpec, 'r14zvysenieSadzby2_10').text = self._bool_to_str(vozidlo.zvysenie_2_10)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby2_20').text = self._bool_to_str(vozidlo.zvysenie_2_20)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby2_30').text = self._bool_to_str(vozidlo.zvysenie_2_30)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby2_40').text = self._bool_to_str(vozidlo.zvysenie_2_40)
-        etree.SubElement(stlpec, 'r14zvysenieSadzby2_50').text = self._bool_to_str(vozidlo.zvysenie_2_50)
-        
-        # Ročné sadzby
-        etree.SubElement(stlpec, 'r15rocnaSadzba_1').text = self._num_to_str(vozidlo.rocna_sadzba_1)
-        etree.SubElement(stlpec, 'r15rocnaSadzba_2').text = self._num_to_str(vozidlo.rocna_sadzba_2)
-        
-        # Ekologické zníženie
-        etree.SubElement(stlpec, 'r16hybrid').text = self._bool_to_str(vozidlo.hybrid)
-        etree.SubElement(stlpec, 'r16plyn').text = self._bool_to_str(vozidlo.plyn)
-        etree.SubElement(stlpec, 'r16vodik').text = self._bool_to_str(vozidlo.vodik)
-        
-        # Sadzby po znížení
-        etree.SubElement(stlpec, 'r17sadzba1').text = self._num_to_str(vozidlo.sadzba_po_znizeni_1)
-        etree.SubElement(stlpec, 'r17sadzba2').text = self._num_to_str(vozidlo.sadzba_po_znizeni_2)
-        
-        # Kombinovaná doprava
-        etree.SubElement(stlpec, 'r18KombiDoprava').text = self._bool_to_str(vozidlo.kombi_doprava)
-        
-        # Sadzby pre kombi
-        etree.SubElement(stlpec, 'r19sadzba1').text = self._num_to_str(vozidlo.sadzba_kombi_1)
-        etree.SubElement(stlpec, 'r19sadzba2').text = self._num_to_str(vozidlo.sadzba_kombi_2)
-        
-        # Počet mesiacov a dní
-        etree.SubElement(stlpec, 'r20aPocMesS1').text = self._int_to_str(vozidlo.pocet_mesiacov_1)
-        etree.SubElement(stlpec, 'r20aPocMesS2').text = self._int_to_str(vozidlo.pocet_mesiacov_2)
-        etree.SubElement(stlpec, 'r20bPocDniS1').text = self._int_to_str(vozidlo.pocet_dni_1)
-        etree.SubElement(stlpec, 'r20bPocDniS2').text = self._int_to_str(vozidlo.pocet_dni_2)
-        
-        # Daň
-        etree.SubElement(stlpec, 'r21dan1').text = self._num_to_str(vozidlo.dan_1)
-        etree.SubElement(stlpec, 'r21dan2').text = self._num_to_str(vozidlo.dan_2)
-        
-        # Sumarizácia
-        etree.SubElement(stlpec, 'r22').text = self._num_to_str(vozidlo.r22)
-        etree.SubElement(stlpec, 'r23').text = self._num_to_str(vozidlo.r23)
-        etree.SubElement(stlpec, 'r24').text = self._num_to_str(vozidlo.r24)
-        etree.SubElement(stlpec, 'r25').text = self._num_to_str(vozidlo.r25)
-        
-        return stlpec
-    
-    def validuj_xml(self, xml_str: str, xsd_path: str) -> tuple[bool, str]:
-        """Validuje XML oproti XSD schéme."""
+            vozidlo = self._PRAZDNE_VOZIDLO
+        
+        # Lokálne väzby - v cykle ~55 polí sa vyhnú opakovanému hľadaniu atribútov
+        xml_bool = _xml_bool
+        for prvok, (_, get, conv) in zip(stlpec, _STLPEC_POLIA):
+            value = get(vozidlo)
+            if conv is xml_bool:
+                value = '1' if value else '0'
+            elif conv:
+                value = conv(value)
+            prvok.text = value
+    
+    def validuj_xml(self, xml_str: str, xsd_path: str = _XSD_PATH) -> tuple[bool, str]:
+        """Validuje XML oproti XSD schéme (schéma sa kompiluje len raz)."""
         try:
-            xsd_doc = etree.parse(xsd_path)
-            xsd_schema = etree.XMLSchema(xsd_doc)
+            xsd_schema = _nacitaj_xsd_schemu(xsd_path)
             
-            xml_doc = etree.fromstring(xml_str.encode('utf-8'))
+            # Veľké priznania bez limitov libxml2, bez tabuľky ID (XSD ich nepotrebuje)
+            parser = etree.XMLParser(huge_tree=True, collect_ids=False)
+            xml_doc = etree.fromstring(xml_str.encode('utf-8') if isinstance(xml_str, str) else xml_str, parser)
             
-            if xsd_schema.validate(xml_doc):
-                return True, "XML je validné"
-            else:
-                errors = [str(e) for e in xsd_schema.error_log]
-                return False, "\n".join(errors)
+            xsd_schema.assertValid(xml_doc)
+            return True, "XML je validné"
+        except etree.DocumentInvalid as e:
+            return False, "\n".join(str(chyba) for chyba in e.error_log)
         except Exception as e:
             return False, f"Chyba pri validácii: {str(e)}"
 
@@ -1507,6 +2222,10 @@ class XMLGenerator:
 # HLAVNÁ APLIKÁCIA
 # =============================================================================
 
+def _bez_vypisu(*args, **kwargs) -> None:
+    """Náhrada print pri vypnutom výpise priebehu."""
+
+
 class DMVProcessor:
     """Hlavná trieda pre spracovanie dane z motorových vozidiel."""
     
@@ -1514,47 +2233,62 @@ class DMVProcessor:
         self.db = Database(db_path)
         self.extractor = PDFExtractor()
         self.generator = XMLGenerator()
-        self.register = RegisterConnector()
+        self.register = RegisterConnector(cache_path=db_path)
         self.kalkulator = None  # Inicializuje sa podľa roku
     
-    def spracuj_pdf(self, pdf_path: str, over_v_registri: bool = True) -> tuple[Spolocnost, List[Vozidlo]]:
+    def clear_register_cache(self) -> None:
+        """Vyprázdni cache odpovedí registrov (v pamäti aj v databáze)."""
+        self.register.clear_cache()
+    
+    def spracuj_pdf(
+        self,
+        pdf_path: str,
+        over_v_registri: bool = True,
+        verbose: bool = True,
+        extractor: Optional[PDFExtractor] = None
+    ) -> tuple[Spolocnost, List[Vozidlo]]:
         """
         Spracuje PDF súbor a extrahuje údaje o spoločnosti a vozidlách.
         
         Args:
             pdf_path: Cesta k PDF súboru
             over_v_registri: Či overiť údaje v ORSR/RÚZ
+            verbose: Či vypisovať priebeh na stdout
+            extractor: Iný PDFExtractor než vlastný (napr. zapožičaný z poolu v serveri)
             
         Returns:
             Tuple (spoločnosť, zoznam vozidiel)
         """
-        print(f"Spracúvam PDF: {pdf_path}")
+        vypis = print if verbose else _bez_vypisu
+        extractor = extractor or self.extractor
+        vypis(f"Spracúvam PDF: {pdf_path}")
         
         # Extrahuj text
-        text = self.extractor.extrahuj_text_z_pdf(pdf_path)
-        print(f"Extrahovaný text ({len(text)} znakov)")
+        text = extractor.extrahuj_text_z_pdf(pdf_path)
+        vypis(f"Extrahovaný text ({len(text)} znakov)")
         
         # Extrahuj tabuľky
-        tabulky = self.extractor.extrahuj_tabulky_z_pdf(pdf_path)
-        print(f"Nájdených tabuliek: {len(tabulky)}")
+        tabulky = extractor.extrahuj_tabulky_z_pdf(pdf_path)
+        vypis(f"Nájdených tabuliek: {len(tabulky)}")
         
         # Parsuj spoločnosť
-        spolocnost = self.extractor.parsuj_spolocnost(text)
+        spolocnost = extractor.parsuj_spolocnost(text)
         
-        # Overenie a doplnenie z registrov
+        # Overenie a doplnenie z registrov - odpovede registrov cachuje RegisterConnector (len úspešné
+        # a "nenájdené", s expiráciou), údaje sa vždy doplnia do spoločnosti z aktuálneho PDF
         if over_v_registri and spolocnost.dic:
-            print("Overujem údaje v registroch...")
+            vypis("Overujem údaje v registroch...")
             spolocnost, uspech = self.register.over_a_doplni_spolocnost(spolocnost)
             if uspech:
-                print("✓ Údaje overené a doplnené")
+                vypis("✓ Údaje overené a doplnené")
             else:
-                print("⚠ Údaje sa nepodarilo overiť")
+                vypis("⚠ Údaje sa nepodarilo overiť")
         
         # Parsuj vozidlá z textu
-        vozidla_text = [self.extractor.parsuj_vozidlo(text)]
+        vozidla_text = [extractor.parsuj_vozidlo(text)]
         
         # Parsuj vozidlá z tabuliek
-        vozidla_tabulky = self.extractor.parsuj_vozidla_z_tabulky(tabulky)
+        vozidla_tabulky = extractor.parsuj_vozidla_z_tabulky(tabulky)
         
         # Kombinuj vozidlá (preferuj tabuľkové, ak existujú)
         if vozidla_tabulky:
@@ -1562,8 +2296,8 @@ class DMVProcessor:
         else:
             vozidla = [v for v in vozidla_text if v.evc]
         
-        print(f"Nájdená spoločnosť: {spolocnost.po_obchodne_meno}")
-        print(f"Nájdených vozidiel: {len(vozidla)}")
+        vypis(f"Nájdená spoločnosť: {spolocnost.po_obchodne_meno}")
+        vypis(f"Nájdených vozidiel: {len(vozidla)}")
         
         return spolocnost, vozidla
     
@@ -1581,13 +2315,14 @@ class DMVProcessor:
         spolocnost, uspech = self.register.over_a_doplni_spolocnost(spolocnost)
         return spolocnost if uspech else None
     
-    def vypocitaj_dane(self, vozidla: List[Vozidlo], rok: int = None) -> List[Vozidlo]:
+    def vypocitaj_dane(self, vozidla: List[Vozidlo], rok: int = None, verbose: bool = True) -> List[Vozidlo]:
         """
         Vypočíta dane pre všetky vozidlá.
         
         Args:
             vozidla: Zoznam vozidiel
             rok: Zdaňovacie obdobie
+            verbose: Či vypísať daň každého vozidla
             
         Returns:
             Zoznam vozidiel s vypočítanými daňami
@@ -1596,10 +2331,11 @@ class DMVProcessor:
             rok = datetime.now().year - 1
         
         self.kalkulator = KalkulatorDane(rok)
+        self.kalkulator.vypocitaj_dan_pre_vozidla(vozidla)
         
-        for vozidlo in vozidla:
-            self.kalkulator.vypocitaj_dan_pre_vozidlo(vozidlo)
-            print(f"  {vozidlo.evc}: {vozidlo.kategoria} -> {vozidlo.dan_1:.2f} EUR")
+        if verbose:
+            for vozidlo in vozidla:
+                print(f"  {vozidlo.evc}: {vozidlo.kategoria} -> {vozidlo.dan_1:.2f} EUR")
         
         return vozidla
     
@@ -1609,7 +2345,8 @@ class DMVProcessor:
         vozidla: List[Vozidlo],
         rok: int = None,
         typ: str = 'RDP',
-        vypocitaj_dane: bool = True
+        vypocitaj_dane: bool = True,
+        verbose: bool = True
     ) -> DanovePriznanie:
         """
         Vytvorí daňové priznanie z údajov.
@@ -1620,6 +2357,7 @@ class DMVProcessor:
             rok: Zdaňovacie obdobie (rok), default aktuálny rok - 1
             typ: Typ priznania (RDP, ODP, DDP)
             vypocitaj_dane: Či automaticky vypočítať dane
+            verbose: Či vypisovať priebeh výpočtu
             
         Returns:
             Kompletné daňové priznanie
@@ -1629,10 +2367,12 @@ class DMVProcessor:
         
         # Vypočítaj dane ak je požadované
         if vypocitaj_dane:
-            print(f"\nVypočítavam dane za rok {rok}:")
-            vozidla = self.vypocitaj_dane(vozidla, rok)
+            if verbose:
+                print(f"\nVypočítavam dane za rok {rok}:")
+            vozidla = self.vypocitaj_dane(vozidla, rok, verbose=verbose)
         
-        priznanie = DanovePriznanie()
+        # Spoločnosť a vozidlá sa odovzdajú priamo - bez prázdnej Spolocnost/Adresa z default_factory
+        priznanie = DanovePriznanie(spolocnost=spolocnost, vozidla=vozidla)
         
         # Typ priznania
         priznanie.rdp = typ == 'RDP'
@@ -1643,18 +2383,14 @@ class DMVProcessor:
         priznanie.obdobie_od = f"1.1.{rok}"
         priznanie.obdobie_do = f"31.12.{rok}"
         
-        # Spoločnosť
-        priznanie.spolocnost = spolocnost
-        
-        # Vozidlá
-        priznanie.vozidla = vozidla
-        
         # Súhrnné údaje
         priznanie.r35_pocet_vozidiel = len(vozidla)
         
-        # Vypočítaj súhrnné dane
-        dan_spolu = sum(v.r22 for v in vozidla)
-        oslobodenie = sum(v.r23 for v in vozidla)
+        # Vypočítaj súhrnné dane (jeden prechod cez vozidlá)
+        dan_spolu = oslobodenie = 0.0
+        for v in vozidla:
+            dan_spolu += v.r22
+            oslobodenie += v.r23
         
         priznanie.r36_dan_spolu = dan_spolu
         priznanie.r37_oslobodenie = oslobodenie
@@ -1681,18 +2417,14 @@ class DMVProcessor:
         Returns:
             Cesta k vygenerovanému súboru
         """
-        # Generuj XML
-        xml_content = self.generator.generuj_xml(priznanie)
-        
         # Určí názov súboru
         if output_path is None:
             dic = priznanie.spolocnost.dic or "neznamy"
             rok = priznanie.obdobie_od.split('.')[-1] if priznanie.obdobie_od else datetime.now().year
             output_path = f"dmv_{dic}_{rok}.xml"
         
-        # Ulož súbor
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
+        # Zapíš XML postupne po stranách (celý strom sa nedrží v pamäti)
+        self.generator.generuj_xml_stream(priznanie, output_path)
         
         print(f"XML súbor vytvorený: {output_path}")
         
@@ -1709,14 +2441,15 @@ class DMVProcessor:
         Returns:
             ID spoločnosti v databáze
         """
-        # Ulož spoločnosť
-        spolocnost_id = self.db.uloz_spolocnost(spolocnost)
-        print(f"Spoločnosť uložená s ID: {spolocnost_id}")
-        
-        # Ulož vozidlá
-        for vozidlo in vozidla:
-            vozidlo_id = self.db.uloz_vozidlo(vozidlo, spolocnost_id)
-            print(f"Vozidlo {vozidlo.evc} uložené s ID: {vozidlo_id}")
+        # Spoločnosť aj vozidlá v jednej transakcii (jeden commit)
+        with self.db.transaction():
+            # Ulož spoločnosť
+            spolocnost_id = self.db.uloz_spolocnost(spolocnost)
+            print(f"Spoločnosť uložená s ID: {spolocnost_id}")
+            
+            # Ulož vozidlá jedným executemany
+            pocet = self.db.uloz_vozidla_hromadne(vozidla, spolocnost_id)
+            print(f"Uložených vozidiel: {pocet}")
         
         return spolocnost_id
     
@@ -1750,73 +2483,162 @@ class DMVProcessor:
         xml_path = self.generuj_xml_subor(priznanie, output_xml)
         
         return xml_path
+    
+    def spracuj_batch(self, pdf_paths: List[str], rok: int = None, workers: int = None) -> List[str]:
+        """
+        Kompletné spracovanie viacerých PDF paralelne v samostatných procesoch.
+        
+        Každý proces má vlastný DMVProcessor (vlastné SQLite spojenie) nad tou istou databázou.
+        
+        Args:
+            pdf_paths: Cesty k PDF súborom
+            rok: Zdaňovacie obdobie
+            workers: Počet procesov (default počet CPU)
+            
+        Returns:
+            Cesty k vygenerovaným XML súborom v poradí vstupu
+        """
+        if len(pdf_paths) <= 1:
+            return [self.spracuj_kompletne(pdf_path, rok=rok) for pdf_path in pdf_paths]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_inicializuj_batch_proces,
+            initargs=(self.db.db_path,)
+        ) as executor:
+            return list(executor.map(_spracuj_batch_pdf, pdf_paths, repeat(rok)))
+
+
+# Procesor v pracovnom procese spracuj_batch (jeden na proces)
+_BATCH_PROCESSOR: Optional[DMVProcessor] = None
+
+
+def _inicializuj_batch_proces(db_path: str) -> None:
+    """Initializer pracovného procesu - vytvorí vlastný DMVProcessor."""
+    global _BATCH_PROCESSOR
+    _BATCH_PROCESSOR = DMVProcessor(db_path)
+
+
+def _spracuj_batch_pdf(pdf_path: str, rok: Optional[int]) -> str:
+    """Spracuje jedno PDF v pracovnom procese (musí byť na úrovni modulu kvôli pickle)."""
+    return _BATCH_PROCESSOR.spracuj_kompletne(pdf_path, rok=rok)
 
 
 # =============================================================================
 # CLI ROZHRANIE
 # =============================================================================
 
-def main():
-    """Hlavná funkcia pre CLI použitie."""
-    import argparse
-    
-    parser = argparse.ArgumentParser(
-        description='DMV Processor v2.0 - Spracovanie dane z motorových vozidiel SR',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_CLI_POPIS = 'DMV Processor v2.0 - Spracovanie dane z motorových vozidiel SR'
+_CLI_PRIKLADY = """
 Príklady použitia:
   python dmv_processor.py spracuj dokument.pdf -r 2024
   python dmv_processor.py over 2020123456
   python dmv_processor.py vypocet -k M1 -o 1998 -d 15.3.2020 -r 2024
   python dmv_processor.py demo -o demo.xml -r 2024
-        """
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Príkazy')
-    
-    # Príkaz: spracuj
-    spracuj_parser = subparsers.add_parser('spracuj', help='Spracuj PDF a vytvor XML')
-    spracuj_parser.add_argument('pdf', help='Cesta k PDF súboru')
-    spracuj_parser.add_argument('-o', '--output', help='Výstupný XML súbor')
-    spracuj_parser.add_argument('-r', '--rok', type=int, help='Zdaňovacie obdobie (rok)')
-    spracuj_parser.add_argument('-d', '--db', default='dmv_database.db', help='Cesta k databáze')
-    spracuj_parser.add_argument('--bez-overenia', action='store_true', help='Preskočiť overenie v ORSR/RÚZ')
-    
-    # Príkaz: over (NOVÉ)
-    over_parser = subparsers.add_parser('over', help='Overí spoločnosť v ORSR / RÚZ')
-    over_parser.add_argument('ico_dic', help='IČO alebo DIČ spoločnosti')
-    
-    # Príkaz: vypocet (NOVÉ)
-    vypocet_parser = subparsers.add_parser('vypocet', help='Vypočíta daň pre vozidlo')
-    vypocet_parser.add_argument('-k', '--kategoria', default='M1', help='Kategória (L, M1, N1, O1-O4)')
-    vypocet_parser.add_argument('-o', '--objem', type=float, default=0, help='Objem valcov cm³')
-    vypocet_parser.add_argument('-m', '--hmotnost', type=float, default=0, help='Hmotnosť v kg')
-    vypocet_parser.add_argument('-n', '--napravy', type=int, default=2, help='Počet náprav')
-    vypocet_parser.add_argument('-d', '--datum', help='Dátum prvej evidencie (dd.mm.yyyy)')
-    vypocet_parser.add_argument('-r', '--rok', type=int, help='Zdaňovacie obdobie')
-    vypocet_parser.add_argument('--hybrid', action='store_true', help='Hybridné vozidlo')
-    vypocet_parser.add_argument('--plyn', action='store_true', help='Vozidlo na CNG/LPG')
-    vypocet_parser.add_argument('--mesiacov', type=int, default=12, help='Počet mesiacov')
-    
-    # Príkaz: zoznam
-    zoznam_parser = subparsers.add_parser('zoznam', help='Zobraz zoznam spoločností')
-    zoznam_parser.add_argument('-d', '--db', default='dmv_database.db', help='Cesta k databáze')
-    
-    # Príkaz: export
-    export_parser = subparsers.add_parser('export', help='Exportuj XML pre existujúcu spoločnosť')
-    export_parser.add_argument('dic', help='DIČ spoločnosti')
-    export_parser.add_argument('-o', '--output', help='Výstupný XML súbor')
-    export_parser.add_argument('-r', '--rok', type=int, help='Zdaňovacie obdobie (rok)')
-    export_parser.add_argument('-d', '--db', default='dmv_database.db', help='Cesta k databáze')
-    
-    # Príkaz: demo
-    demo_parser = subparsers.add_parser('demo', help='Vytvor demo XML s ukážkovými údajmi')
-    demo_parser.add_argument('-o', '--output', default='demo_dmv.xml', help='Výstupný XML súbor')
-    demo_parser.add_argument('-r', '--rok', type=int, default=2024, help='Zdaňovacie obdobie')
-    
-    args = parser.parse_args()
-    
-    if args.command == 'spracuj':
+"""
+
+# Prepínač: (krátky, dlhý, atribút, typ, predvolená hodnota, popis); typ bool = príznak bez hodnoty
+_VOLBA_DB = ('-d', '--db', 'db', str, 'dmv_database.db', 'Cesta k databáze')
+
+# Príkaz -> (popis, pozičné argumenty [(atribút, popis)], prepínače)
+_CLI_PRIKAZY = {
+    'spracuj': ('Spracuj PDF a vytvor XML', [('pdf', 'Cesta k PDF súboru')], [
+        ('-o', '--output', 'output', str, None, 'Výstupný XML súbor'),
+        ('-r', '--rok', 'rok', int, None, 'Zdaňovacie obdobie (rok)'),
+        _VOLBA_DB,
+        (None, '--bez-overenia', 'bez_overenia', bool, False, 'Preskočiť overenie v ORSR/RÚZ'),
+    ]),
+    'over': ('Overí spoločnosť v ORSR / RÚZ', [('ico_dic', 'IČO alebo DIČ spoločnosti')], [_VOLBA_DB]),
+    'vypocet': ('Vypočíta daň pre vozidlo', [], [
+        ('-k', '--kategoria', 'kategoria', str, 'M1', 'Kategória (L, M1, N1, O1-O4)'),
+        ('-o', '--objem', 'objem', float, 0, 'Objem valcov cm³'),
+        ('-m', '--hmotnost', 'hmotnost', float, 0, 'Hmotnosť v kg'),
+        ('-n', '--napravy', 'napravy', int, 2, 'Počet náprav'),
+        ('-d', '--datum', 'datum', str, None, 'Dátum prvej evidencie (dd.mm.yyyy)'),
+        ('-r', '--rok', 'rok', int, None, 'Zdaňovacie obdobie'),
+        (None, '--hybrid', 'hybrid', bool, False, 'Hybridné vozidlo'),
+        (None, '--plyn', 'plyn', bool, False, 'Vozidlo na CNG/LPG'),
+        (None, '--mesiacov', 'mesiacov', int, 12, 'Počet mesiacov'),
+    ]),
+    'zoznam': ('Zobraz zoznam spoločností', [], [_VOLBA_DB]),
+    'export': ('Exportuj XML pre existujúcu spoločnosť', [('dic', 'DIČ spoločnosti')], [
+        ('-o', '--output', 'output', str, None, 'Výstupný XML súbor'),
+        ('-r', '--rok', 'rok', int, None, 'Zdaňovacie obdobie (rok)'),
+        _VOLBA_DB,
+    ]),
+    'demo': ('Vytvor demo XML s ukážkovými údajmi', [], [
+        ('-o', '--output', 'output', str, 'demo_dmv.xml', 'Výstupný XML súbor'),
+        ('-r', '--rok', 'rok', int, 2024, 'Zdaňovacie obdobie'),
+    ]),
+}
+
+def _cli_pomoc(prikaz: Optional[str] = None) -> None:
+    """Vypíše pomoc k programu alebo k jednému príkazu."""
+    if prikaz is None:
+        print(f"usage: dmv_processor.py {{{','.join(_CLI_PRIKAZY)}}} ...\n\n{_CLI_POPIS}\n\nPríkazy:")
+        for nazov, (popis, _, _) in _CLI_PRIKAZY.items():
+            print(f"  {nazov:10} {popis}")
+        print(_CLI_PRIKLADY)
+        return
+    
+    popis, pozicne, volby = _CLI_PRIKAZY[prikaz]
+    print(f"usage: dmv_processor.py {prikaz} [prepínače] {' '.join(a for a, _ in pozicne)}\n\n{popis}\n")
+    for atribut, text in pozicne:
+        print(f"  {atribut:24} {text}")
+    for kratky, dlhy, _, typ, _, text in volby:
+        prepinac = ', '.join(p for p in (kratky, dlhy) if p) + ('' if typ is bool else ' HODNOTA')
+        print(f"  {prepinac:24} {text}")
+
+def _cli_argumenty(prikaz: str, argv: List[str]):
+    """Rozparsuje argumenty príkazu cez getopt; pri chybe skončí s kódom 2 ako argparse."""
+    from getopt import gnu_getopt, GetoptError
+    from types import SimpleNamespace
+    
+    _, pozicne, volby = _CLI_PRIKAZY[prikaz]
+    args = SimpleNamespace(**{volba[2]: volba[4] for volba in volby})
+    podla_prepinaca = {}
+    kratke, dlhe = 'h', ['help']
+    for volba in volby:
+        kratky, dlhy, _, typ, _, _ = volba
+        if kratky:
+            kratke += kratky[1] + ('' if typ is bool else ':')
+            podla_prepinaca[kratky] = volba
+        dlhe.append(dlhy[2:] + ('' if typ is bool else '='))
+        podla_prepinaca[dlhy] = volba
+    
+    try:
+        zadane, zvysne = gnu_getopt(argv, kratke, dlhe)
+        for prepinac, hodnota in zadane:
+            if prepinac in ('-h', '--help'):
+                _cli_pomoc(prikaz)
+                sys.exit(0)
+            _, _, atribut, typ, _, _ = podla_prepinaca[prepinac]
+            setattr(args, atribut, True if typ is bool else typ(hodnota))
+        if len(zvysne) != len(pozicne):
+            raise GetoptError(f"očakávané argumenty: {' '.join(a for a, _ in pozicne) or 'žiadne'}")
+    except (GetoptError, ValueError) as e:
+        print(f"dmv_processor.py {prikaz}: chyba: {e}", file=sys.stderr)
+        sys.exit(2)
+    
+    for (atribut, _), hodnota in zip(pozicne, zvysne):
+        setattr(args, atribut, hodnota)
+    return args
+
+def main():
+    """Hlavná funkcia pre CLI použitie."""
+    # Paralelné OCR spúšťa viac procesov tesseract - jedno vlákno OpenMP na proces, aby sa nepreťažovali
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ('-h', '--help'):
+        _cli_pomoc()
+        return
+    
+    prikaz = argv[0]
+    if prikaz not in _CLI_PRIKAZY:
+        print(f"dmv_processor.py: chyba: neznámy príkaz '{prikaz}' (možnosti: {', '.join(_CLI_PRIKAZY)})", file=sys.stderr)
+        sys.exit(2)
+    args = _cli_argumenty(prikaz, argv[1:])
+    
+    if prikaz == 'spracuj':
         processor = DMVProcessor(args.db)
         spolocnost, vozidla = processor.spracuj_pdf(args.pdf, not getattr(args, 'bez_overenia', False))
         processor.uloz_do_databazy(spolocnost, vozidla)
@@ -1824,16 +2646,20 @@ Príklady použitia:
         xml_path = processor.generuj_xml_subor(priznanie, args.output)
         print(f"\n✓ Hotovo! XML súbor: {xml_path}")
     
-    elif args.command == 'over':
+    elif prikaz == 'over':
         print(f"\n{'='*60}")
         print(f"Overenie spoločnosti: {args.ico_dic}")
         print('='*60)
         
-        connector = RegisterConnector()
-        ico = re.sub(r'\D', '', args.ico_dic)
+        # Rovnaká databáza ako pri spracuj/serveri - perzistentná cache registrov platí aj pre nový proces
+        connector = RegisterConnector(cache_path=args.db)
+        ico = _RE_NECISLICE.sub('', args.ico_dic)
         
         if len(ico) == 10 and ico.startswith('20'):
             ico = ico[2:]
+        if not 6 <= len(ico) <= 8:
+            print("  ✗ Neplatné IČO/DIČ", file=sys.stderr)
+            sys.exit(2)
         
         print("\n[1/2] Hľadám v Registri účtovných závierok...")
         data = connector.vyhladaj_v_ruz_podla_ico(ico)
@@ -1862,7 +2688,7 @@ Príklady použitia:
         else:
             print("\n⚠ Spoločnosť nebola nájdená v žiadnom registri.")
     
-    elif args.command == 'vypocet':
+    elif prikaz == 'vypocet':
         rok = args.rok or (datetime.now().year - 1)
         print(f"\n{'='*60}")
         print(f"Výpočet dane z motorového vozidla za rok {rok}")
@@ -1889,32 +2715,32 @@ Príklady použitia:
             print(f"  Hmotnosť:            {args.hmotnost} kg")
         if args.datum:
             print(f"  Prvá evidencia:      {args.datum}")
-            print(f"  Vek vozidla:         {vypocet['vek_mesiacov']} mesiacov")
+            print(f"  Vek vozidla:         {vypocet.vek_mesiacov} mesiacov")
         if args.hybrid:
             print(f"  Pohon:               Hybrid (-50%)")
         if args.plyn:
             print(f"  Pohon:               CNG/LPG (-50%)")
         
         print(f"\nVýpočet dane:")
-        print(f"  1. Základná sadzba:     {vypocet['zakladna_sadzba']:>8} EUR")
+        print(f"  1. Základná sadzba:     {vypocet.zakladna_sadzba:>8} EUR")
         
-        koef = vypocet['koeficient_veku']
+        koef = vypocet.koeficient_veku
         if koef != 1.0:
             zmena = "zníženie" if koef < 1 else "zvýšenie"
             percento = abs(int((koef - 1.0) * 100))
             print(f"  2. Úprava podľa veku ({zmena} {percento}%):")
-            print(f"                          {vypocet['sadzba_po_veku']:>8.2f} EUR")
+            print(f"                          {vypocet.sadzba_po_veku:>8.2f} EUR")
         
-        if vypocet['koeficient_eko'] != 1.0:
-            print(f"  3. Zníženie eko (-50%): {vypocet['sadzba_po_eko']:>8.2f} EUR")
+        if vypocet.koeficient_eko != 1.0:
+            print(f"  3. Zníženie eko (-50%): {vypocet.sadzba_po_eko:>8.2f} EUR")
         
-        print(f"\n  Ročná sadzba:           {vypocet['sadzba_finalna']:>8.2f} EUR")
+        print(f"\n  Ročná sadzba:           {vypocet.sadzba_finalna:>8.2f} EUR")
         print(f"  Počet mesiacov:         {args.mesiacov:>8}")
         print(f"  {'─'*38}")
-        print(f"  DAŇ ZA ROK {rok}:        {vypocet['dan']:>8.2f} EUR")
+        print(f"  DAŇ ZA ROK {rok}:        {vypocet.dan:>8.2f} EUR")
         print('='*60)
     
-    elif args.command == 'zoznam':
+    elif prikaz == 'zoznam':
         db = Database(args.db)
         spolocnosti = db.zoznam_spolocnosti()
         
@@ -1927,7 +2753,7 @@ Príklady použitia:
                 nazov = s.po_obchodne_meno[0] if s.po_obchodne_meno else "Neznámy názov"
                 print(f"DIČ: {s.dic:15} | {nazov}")
     
-    elif args.command == 'export':
+    elif prikaz == 'export':
         processor = DMVProcessor(args.db)
         
         spolocnost = processor.db.najdi_spolocnost_podla_dic(args.dic)
@@ -1940,7 +2766,7 @@ Príklady použitia:
         xml_path = processor.generuj_xml_subor(priznanie, args.output)
         print(f"\n✓ Hotovo! XML súbor: {xml_path}")
     
-    elif args.command == 'demo':
+    elif prikaz == 'demo':
         rok = args.rok
         spolocnost = Spolocnost(
             po=True,
@@ -1977,9 +2803,6 @@ Príklady použitia:
         priznanie = processor.vytvor_priznanie(spolocnost, vozidla, rok)
         xml_path = processor.generuj_xml_subor(priznanie, args.output)
         print(f"\n✓ Demo XML súbor vytvorený: {xml_path}")
-    
-    else:
-        parser.print_help()
 
 
 if __name__ == "__main__":
@@ -7,13 +7,15 @@ Spustenie: python dmv_server.py
 Server: http://localhost:5100 (konfigurovateľné v config.json)
 """
 
-import os, sys, json, re, tempfile, base64
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import os, sys, io, json, re, tempfile, base64, threading, time, queue, importlib, functools
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 from dmv_processor import (
-    DMVProcessor, KalkulatorDane, RegisterConnector,
-    Spolocnost, Vozidlo, Adresa
+    DMVProcessor, KalkulatorDane, PDFExtractor,
+    Spolocnost, Vozidlo, Adresa, _RE_NECISLICE
 )
 
 # Načítaj konfiguráciu
@@ -28,20 +30,282 @@ if os.path.exists(CONFIG_FILE):
         loaded = json.load(f)
         CONFIG.update(loaded)
 
+# Vlákna pre súbežné dopyty do RÚZ a RPO
+REGISTER_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Počet súbežných OCR vlákien pri nahratí skenovaného PDF
+OCR_WORKERS = min(8, os.cpu_count() or 1)
+
+# Ťažké voliteľné knižnice (pdfplumber, pdf2image, pytesseract, PIL) sa načítajú až pri prvom nahratí
+_LENIVE_IMPORTY = {}
+
+def _lenivy_import(nazov):
+    """Importuje modul pri prvom použití; modul aj ImportError si zapamätá pre ďalšie požiadavky."""
+    modul = _LENIVE_IMPORTY.get(nazov)
+    if modul is None:
+        try:
+            modul = importlib.import_module(nazov)
+        except ImportError as e:
+            modul = e
+        _LENIVE_IMPORTY[nazov] = modul
+    if isinstance(modul, ImportError):
+        raise ImportError(str(modul))
+    return modul
+
+@functools.lru_cache(maxsize=16)
+def _kalkulator(rok):
+    """Zdieľaný KalkulatorDane pre rok - po vytvorení sa nemení, takže ho môžu používať všetky vlákna."""
+    return KalkulatorDane(rok)
+
+def _parsuj_bool(hodnota) -> bool:
+    """Boolean z JSON hodnoty alebo textu formulára ('0', 'false', 'no' = False)."""
+    if isinstance(hodnota, str):
+        return hodnota.strip().lower() not in ('', '0', 'false', 'no', 'off')
+    return bool(hodnota)
+
+def _zvys_kontrast(gray, faktor):
+    """
+    Rovnaký výsledok ako ImageEnhance.Contrast(gray).enhance(faktor) pre obrázok 'L',
+    ale jedným prechodom cez 256-prvkovú tabuľku (bez pomocného obrázka a blend).
+    """
+    histogram = gray.histogram()
+    pocet = sum(histogram) or 1
+    priemer = int(sum(i * n for i, n in enumerate(histogram)) / pocet + 0.5)
+    lut = [min(255, max(0, int(priemer + faktor * (v - priemer)))) for v in range(256)]
+    return gray.point(lut)
+
+def _nahlad_base64(image):
+    """Zmenší stranu (na mieste) pre prenos a vráti ju ako base64 JPEG."""
+    Image = _lenivy_import('PIL.Image')
+    
+    max_size = (800, 1100)
+    image.thumbnail(max_size, Image.Resampling.BILINEAR)
+    
+    # JPEG - menší a rýchlejší ako PNG s optimize
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, format='JPEG', quality=75, progressive=True, optimize=False)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+# Predkompilované regexy (volajú sa pri každej požiadavke)
+_RE_MENO_POLA = re.compile(r'\bname="([^"]*)"')
+_RE_NAZOV_SUBORU = re.compile(r'\bfilename="([^"]*)"')
+
+MULTIPART_BLOK = 64 * 1024
+JSON_BLOK = 64 * 1024
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+def _parsuj_multipart(rfile, content_length, boundary):
+    """
+    Prúdovo spracuje multipart/form-data telo s pamäťou O(blok).
+    Súbor *.pdf zapíše do dočasného súboru, ostatné polia vráti ako text.
+    
+    Returns:
+        Tuple (cesta k dočasnému PDF alebo None, {meno poľa: hodnota})
+    """
+    oddelovac = b'\r\n--' + boundary
+    zostava = content_length
+    buf = bytearray(b'\r\n')  # Prvá hranica nemá pred sebou CRLF - doplní sa
+    
+    def docitaj():
+        nonlocal zostava
+        if zostava <= 0:
+            return False
+        blok = rfile.read(min(MULTIPART_BLOK, zostava))
+        if not blok:
+            zostava = 0
+            return False
+        zostava -= len(blok)
+        buf.extend(blok)
+        return True
+    
+    def najdi(co):
+        while True:
+            idx = buf.find(co)
+            if idx != -1 or not docitaj():
+                return idx
+    
+    tmp_path = None
+    polia = {}
+    
+    # Preamble pred prvou hranicou
+    idx = najdi(oddelovac)
+    if idx == -1:
+        return None, polia
+    del buf[:idx + len(oddelovac)]
+    
+    try:
+        while True:
+            # Za hranicou nasleduje '--' (koniec) alebo CRLF a hlavičky časti
+            while len(buf) < 2 and docitaj():
+                pass
+            if len(buf) < 2:
+                raise ValueError('Neúplné telo požiadavky')
+            if buf[:2] != b'\r\n':
+                break
+            idx = najdi(b'\r\n\r\n')
+            if idx == -1:
+                raise ValueError('Neúplné telo požiadavky')
+            hlavicky = bytes(buf[2:idx]).decode('utf-8', 'replace')
+            del buf[:idx + 4]
+            
+            meno = _RE_MENO_POLA.search(hlavicky)
+            subor = _RE_NAZOV_SUBORU.search(hlavicky)
+            je_pdf = subor is not None and '.pdf' in subor.group(1).lower()
+            
+            if je_pdf:
+                if tmp_path:
+                    os.unlink(tmp_path)  # Platí posledný súbor
+                ciel = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+                tmp_path = ciel.name
+            else:
+                ciel = io.BytesIO()
+            
+            # Telo časti až po ďalšiu hranicu; koniec bufra (možný začiatok hranice) sa podrží
+            with ciel:
+                while True:
+                    idx = buf.find(oddelovac)
+                    if idx != -1:
+                        ciel.write(buf[:idx])
+                        del buf[:idx + len(oddelovac)]
+                        break
+                    bezpecne = len(buf) - len(oddelovac) + 1
+                    if bezpecne > 0:
+                        ciel.write(buf[:bezpecne])
+                        del buf[:bezpecne]
+                    if not docitaj():
+                        # Dáta skončili pred ďalšou hranicou - upload bol prerušený
+                        raise ValueError('Neúplné telo požiadavky')
+                if not je_pdf and meno:
+                    polia[meno.group(1)] = ciel.getvalue().decode('utf-8', 'replace').strip()
+    except BaseException:
+        # Prerušený upload nesmie nechať PDF v dočasnom adresári
+        if tmp_path:
+            os.unlink(tmp_path)
+        raise
+    
+    return tmp_path, polia
+
+def _uloz_telo(rfile, content_length):
+    """Zapíše surové telo požiadavky (application/octet-stream) po blokoch do dočasného PDF a vráti cestu."""
+    zostava = content_length
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+        try:
+            while zostava > 0:
+                blok = rfile.read(min(MULTIPART_BLOK, zostava))
+                if not blok:
+                    raise ValueError('Neúplné telo požiadavky')
+                tmp.write(blok)
+                zostava -= len(blok)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return tmp.name
+
+class TTLCache:
+    """Malá thread-safe cache s expiráciou; neúspešné výsledky (None na prvom mieste) platia kratšie."""
+    
+    def __init__(self, maxsize=512, ttl=3600, ttl_negative=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttl_negative = ttl_negative
+        self._data = {}  # kľúč -> (platí do, hodnota), poradie vloženia = poradie vyhadzovania
+        self._lock = threading.Lock()
+    
+    def get_or_set(self, key, fn):
+        """Vráti platnú hodnotu z cache, inak zavolá fn() a výsledok uloží."""
+        now = time.monotonic()
+        with self._lock:
+            zaznam = self._data.get(key)
+            if zaznam is not None and zaznam[0] > now:
+                return zaznam[1]
+        hodnota = fn()  # Sieťové volanie mimo zámku
+        negativna = hodnota is None or (isinstance(hodnota, tuple) and hodnota[0] is None)
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (now + (self.ttl_negative if negativna else self.ttl), hodnota)
+        return hodnota
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class ExtractorPool:
+    """
+    Malý pool PDFExtractor-ov pre súbežné nahrávania - obmedzí počet naraz spracúvaných PDF;
+    extraktory sa vytvárajú lenivo a opakovane používajú. Databáza ostáva jedna zdieľaná.
+    """
+    
+    def __init__(self, velkost=4):
+        self._volne = queue.LifoQueue()
+        self._sloty = threading.BoundedSemaphore(velkost)
+    
+    @contextmanager
+    def extractor(self):
+        """Požičia extraktor na dobu bloku with (čaká, ak sú všetky obsadené)."""
+        with self._sloty:
+            try:
+                extractor = self._volne.get_nowait()
+            except queue.Empty:
+                extractor = PDFExtractor()
+            try:
+                yield extractor
+            finally:
+                self._volne.put(extractor)
+
+def _najdi_poppler():
+    """Cesta k poppler - z configu alebo prvá existujúca štandardná cesta (zistí sa raz pri štarte)."""
+    poppler_path = CONFIG.get('poppler_path')
+    if not poppler_path:
+        # Skús štandardné cesty
+        import platform
+        if platform.system() == 'Windows':
+            possible_paths = [
+                r'C:\poppler\Library\bin',
+                r'C:\Program Files\poppler\Library\bin',
+                r'C:\Program Files\poppler-24.08.0\Library\bin',
+                os.path.expanduser(r'~\poppler\Library\bin'),
+            ]
+            for p in possible_paths:
+                if os.path.exists(p):
+                    poppler_path = p
+                    break
+        else:
+            poppler_path = '/usr/bin'
+    return poppler_path
+
+POPPLER_PATH = _najdi_poppler()
+
 # Nastav tesseract path ak je definovaný
 if CONFIG.get('tesseract_path'):
     import pytesseract
     pytesseract.pytesseract.tesseract_cmd = os.path.join(CONFIG['tesseract_path'], 'tesseract.exe')
 
-class DMVHandler(SimpleHTTPRequestHandler):
-    processor = DMVProcessor()
-    register = RegisterConnector()
+# Statické súbory GUI, ktoré server sprístupňuje (URL cesta -> (súbor, Content-Type))
+STATIC_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_FILES = {
+    '/': ('dmv_gui.html', 'text/html; charset=utf-8'),
+    '/dmv_gui.html': ('dmv_gui.html', 'text/html; charset=utf-8'),
+    '/dmv_gui.js': ('dmv_gui.js', 'application/javascript; charset=utf-8'),
+    '/TEST_MOZNOST_E.html': ('TEST_MOZNOST_E.html', 'text/html; charset=utf-8'),
+}
+
+class DMVHandler(BaseHTTPRequestHandler):
+    processor = DMVProcessor()  # Jedna zdieľaná DB (RLock) a jej cache riadkov; chyba DB sa prejaví pri štarte
+    register = processor.register
+    extractor_pool = ExtractorPool(velkost=4)
+    overit_cache = TTLCache(maxsize=512, ttl=3600, ttl_negative=60)
+    # HTTP/1.1 kvôli chunked odpovediam JSON; každá odpoveď má Content-Length alebo je chunked
+    protocol_version = 'HTTP/1.1'
     
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def do_GET(self):
@@ -49,22 +313,81 @@ class DMVHandler(SimpleHTTPRequestHandler):
         if parsed.path == '/api/overit':
             self.handle_overit(parsed.query)
         else:
-            super().do_GET()
+            self.serve_static(parsed.path)
+    
+    def serve_static(self, path):
+        """Pošle jeden zo súborov GUI zo zoznamu STATIC_FILES, inak 404."""
+        subor = STATIC_FILES.get(path)
+        if subor is None:
+            self.send_error(404)
+            return
+        nazov, content_type = subor
+        try:
+            with open(os.path.join(STATIC_DIR, nazov), 'rb') as f:
+                obsah = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(obsah)))
+        self.end_headers()
+        self.wfile.write(obsah)
     
     def do_POST(self):
+        # Telo sa nemusí dočítať (chybné požiadavky) - spojenie sa po odpovedi zavrie
+        self.close_connection = True
         parsed = urlparse(self.path)
         if parsed.path == '/api/upload-pdf':
-            self.handle_upload_pdf()
+            self.handle_upload_pdf(parsed.query)
         else:
             self.send_error(404)
     
     def send_json(self, data, status=200):
-        response = json.dumps(data, ensure_ascii=False)
+        """Malá JSON odpoveď (chyby, /api/overit) naraz s Content-Length."""
+        body = JSON_ENCODER.encode(data).encode('utf-8')
         self.send_response(status)
         self.send_header('Content-Type', 'application/json; charset=utf-8')
         self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(response.encode('utf-8'))
+        self.wfile.write(body)
+    
+    def send_json_stream(self, data, status=200):
+        """Veľká JSON odpoveď (text a náhľady strán z uploadu) zapisovaná po častiach."""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        # HTTP/1.1 klient dostane chunked odpoveď (bez vopred známej dĺžky), HTTP/1.0 koniec spojením
+        chunked = self.request_version != 'HTTP/1.0'
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        
+        def zapis(text):
+            data = text.encode('utf-8')
+            if chunked:
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            else:
+                self.wfile.write(data)
+        
+        # JSON sa zapisuje po častiach (náhľady strán sú veľké) - celá odpoveď nevznikne naraz
+        blok = []
+        velkost = 0
+        for cast in JSON_ENCODER.iterencode(data):
+            blok.append(cast)
+            velkost += len(cast)
+            if velkost >= JSON_BLOK:
+                zapis(''.join(blok))
+                blok.clear()
+                velkost = 0
+        if blok:
+            zapis(''.join(blok))
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
     
     def handle_overit(self, query_string):
         """Overí spoločnosť v RÚZ/RPO."""
@@ -75,20 +398,16 @@ class DMVHandler(SimpleHTTPRequestHandler):
             self.send_json({'success': False, 'error': 'Zadajte IČO alebo DIČ'}, 400)
             return
         
-        ico = re.sub(r'\D', '', ico_dic)
+        ico = _RE_NECISLICE.sub('', ico_dic)
         if len(ico) == 10 and ico.startswith('20'):
             ico = ico[2:]
+        if not 6 <= len(ico) <= 8:
+            self.send_json({'success': False, 'error': 'Neplatné IČO/DIČ'}, 400)
+            return
         
         print(f"[API] Overujem IČO: {ico}")
         
-        # Skús najprv RÚZ (má DIČ a kompletnú adresu)
-        data = self.register.vyhladaj_v_ruz_podla_ico(ico)
-        source = "RÚZ"
-        
-        # Ak nie, skús RPO
-        if not data:
-            data = self.register.vyhladaj_v_rpo_podla_ico(ico)
-            source = "RPO"
+        data, source = self.overit_cache.get_or_set(ico, lambda: self._vyhladaj_v_registroch(ico))
         
         if data:
             print(f"[API] Nájdené v {source}: {data.get('nazov', 'N/A')}")
@@ -107,16 +426,33 @@ class DMVHandler(SimpleHTTPRequestHandler):
         else:
             self.send_json({'success': False, 'error': 'Spoločnosť nenájdená'})
     
-    def handle_upload_pdf(self):
-        """Spracuje nahraný PDF."""
+    def _vyhladaj_v_registroch(self, ico):
+        """Vráti (údaje, zdroj) z RÚZ, prípadne z RPO; (None, None) ak subjekt nenájdený."""
+        # Oba registre sa pýtajú súbežne - ak RÚZ subjekt nemá, nečaká sa na dve kolá za sebou
+        f_ruz = REGISTER_POOL.submit(self.register.vyhladaj_v_ruz_podla_ico, ico)
+        f_rpo = REGISTER_POOL.submit(self.register.vyhladaj_v_rpo_podla_ico, ico)
+        
+        # Prednosť má RÚZ (má DIČ a kompletnú adresu)
+        data = f_ruz.result()
+        if data:
+            f_rpo.cancel()
+            return data, "RÚZ"
+        
+        data = f_rpo.result()
+        if data:
+            return data, "RPO"
+        return None, None
+    
+    def handle_upload_pdf(self, query_string=''):
+        """Spracuje nahraný PDF (JSON s base64, multipart alebo surové telo application/octet-stream)."""
+        tmp_path = None
         try:
             content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            
             content_type = self.headers.get('Content-Type', '')
             
             if 'application/json' in content_type:
                 # JSON s base64 encoded PDF
+                body = self.rfile.read(content_length)
                 data = json.loads(body.decode('utf-8'))
                 
                 if 'file' not in data:
@@ -125,37 +461,32 @@ class DMVHandler(SimpleHTTPRequestHandler):
                 
                 pdf_data = base64.b64decode(data['file'])
                 rok = int(data.get('rok', 2024))
+                chce_nahlady = _parsuj_bool(data.get('previews', True))
                 
                 with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
                     tmp.write(pdf_data)
                     tmp_path = tmp.name
                     
             elif 'multipart/form-data' in content_type:
-                # Parsovanie multipart manuálne
-                boundary = content_type.split('boundary=')[1].encode()
-                parts = body.split(b'--' + boundary)
+                # Multipart sa číta prúdovo - PDF ide po blokoch rovno do dočasného súboru
+                boundary = content_type.split('boundary=')[1].split(';')[0].strip().strip('"').encode()
+                tmp_path, polia = _parsuj_multipart(self.rfile, content_length, boundary)
                 
-                pdf_data = None
-                rok = 2024
-                
-                for part in parts:
-                    if b'filename=' in part and b'.pdf' in part.lower():
-                        # Nájdi začiatok dát (po prázdnom riadku)
-                        header_end = part.find(b'\r\n\r\n')
-                        if header_end != -1:
-                            pdf_data = part[header_end + 4:].rstrip(b'\r\n--')
-                    elif b'name="rok"' in part:
-                        header_end = part.find(b'\r\n\r\n')
-                        if header_end != -1:
-                            rok = int(part[header_end + 4:].strip().rstrip(b'\r\n--'))
-                
-                if not pdf_data:
+                if not tmp_path:
                     self.send_json({'success': False, 'error': 'Žiadny PDF súbor'}, 400)
                     return
                 
-                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
-                    tmp.write(pdf_data)
-                    tmp_path = tmp.name
+                rok = int(polia.get('rok') or 2024)
+                chce_nahlady = _parsuj_bool(polia.get('previews', True))
+            elif 'application/octet-stream' in content_type or 'application/pdf' in content_type:
+                # Surové PDF bez obalu - ide po blokoch rovno do dočasného súboru, rok a náhľady v URL
+                if content_length <= 0:
+                    self.send_json({'success': False, 'error': 'Žiadny súbor'}, 400)
+                    return
+                params = parse_qs(query_string)
+                rok = int(params.get('rok', ['2024'])[0] or 2024)
+                chce_nahlady = _parsuj_bool(params.get('previews', ['1'])[0])
+                tmp_path = _uloz_telo(self.rfile, content_length)
             else:
                 self.send_json({'success': False, 'error': 'Neplatný Content-Type'}, 400)
                 return
@@ -166,71 +497,11 @@ class DMVHandler(SimpleHTTPRequestHandler):
             extracted_text = ""
             page_images_base64 = []
             
-            # 1. Konvertuj PDF na obrázky (vždy - pre náhľad)
-            try:
-                from pdf2image import convert_from_path
-                from PIL import Image
-                import io
-                
-                # Cesta k poppler - z configu alebo default
-                poppler_path = CONFIG.get('poppler_path')
-                if not poppler_path:
-                    # Skús štandardné cesty
-                    import platform
-                    if platform.system() == 'Windows':
-                        possible_paths = [
-                            r'C:\poppler\Library\bin',
-                            r'C:\Program Files\poppler\Library\bin',
-                            r'C:\Program Files\poppler-24.08.0\Library\bin',
-                            os.path.expanduser(r'~\poppler\Library\bin'),
-                        ]
-                        for p in possible_paths:
-                            if os.path.exists(p):
-                                poppler_path = p
-                                break
-                    else:
-                        poppler_path = '/usr/bin'
-                
-                print(f"[API] Poppler path: {poppler_path}")
-                
-                # Konvertuj PDF na obrázky
-                print(f"[API] Konvertujem PDF na obrázky: {tmp_path}")
-                images = convert_from_path(
-                    tmp_path, 
-                    dpi=150, 
-                    fmt='png',
-                    poppler_path=poppler_path
-                )
-                print(f"[API] Konvertovaných {len(images)} strán")
-                
-                for i, image in enumerate(images):
-                    try:
-                        # Zmenši pre prenos
-                        max_size = (800, 1100)
-                        image.thumbnail(max_size, Image.Resampling.LANCZOS)
-                        
-                        # Konvertuj na base64
-                        buffer = io.BytesIO()
-                        image.save(buffer, format='PNG', optimize=True)
-                        buffer.seek(0)
-                        img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-                        page_images_base64.append(img_base64)
-                        print(f"[API] Strana {i+1}: {len(img_base64)} bytes base64")
-                    except Exception as e:
-                        print(f"[API] Chyba pri spracovaní strany {i+1}: {e}")
-                    
-                print(f"[API] Vytvorených {len(page_images_base64)} náhľadov")
-                
-            except ImportError as e:
-                print(f"[API] pdf2image nie je nainštalované: {e}")
-            except Exception as e:
-                print(f"[API] Chyba konverzie na obrázky: {e}")
-                import traceback
-                traceback.print_exc()
+            poppler_path = POPPLER_PATH
             
-            # 2. Skús pdfplumber (pre textové PDF)
+            # 1. Skús pdfplumber (pre textové PDF)
             try:
-                import pdfplumber
+                pdfplumber = _lenivy_import('pdfplumber')
                 with pdfplumber.open(tmp_path) as pdf:
                     for page in pdf.pages:
                         page_text = page.extract_text()
@@ -239,27 +510,32 @@ class DMVHandler(SimpleHTTPRequestHandler):
             except Exception as e:
                 print(f"[API] pdfplumber chyba: {e}")
             
-            # 3. Ak text je príliš krátky, skús OCR
+            # 2. Ak text je príliš krátky, skús OCR - každá strana sa vyrenderuje len raz (300 DPI)
+            #    a z toho istého obrázka vznikne aj náhľad, druhý prechod popplerom nie je potrebný
             if len(extracted_text.strip()) < 50:
                 print("[API] Text príliš krátky, skúšam OCR...")
                 try:
-                    from pdf2image import convert_from_path
-                    import pytesseract
-                    from PIL import Image, ImageEnhance, ImageFilter
+                    pdf2image = _lenivy_import('pdf2image')
+                    pytesseract = _lenivy_import('pytesseract')
+                    ImageFilter = _lenivy_import('PIL.ImageFilter')
+                    convert_from_path, pdfinfo_from_path = pdf2image.convert_from_path, pdf2image.pdfinfo_from_path
                     
-                    # Konvertuj PDF na obrázky (vyššie DPI pre OCR)
-                    poppler_path = CONFIG.get('poppler_path') or '/usr/bin'
-                    images_hires = convert_from_path(tmp_path, dpi=300, poppler_path=poppler_path)
-                    ocr_text = ""
+                    # Konvertuj PDF na obrázky (vyššie DPI pre OCR) - po jednej strane
+                    pocet_stran = pdfinfo_from_path(tmp_path, poppler_path=poppler_path)['Pages']
                     
-                    for i, image in enumerate(images_hires):
-                        print(f"[API] OCR strana {i+1}/{len(images_hires)}...")
+                    def ocr_strana(i):
+                        """Vyrenderuje, predspracuje a OCR-uje jednu stranu (beží vo vlákne); vráti (text, náhľad)."""
+                        print(f"[API] OCR strana {i+1}/{pocet_stran}...")
+                        [image] = convert_from_path(
+                            tmp_path, dpi=300, first_page=i + 1, last_page=i + 1, poppler_path=poppler_path
+                        )
                         
                         # Predspracovanie obrázka pre lepšie OCR
                         gray = image.convert('L')
-                        enhancer = ImageEnhance.Contrast(gray)
-                        enhanced = enhancer.enhance(2.0)
+                        enhanced = _zvys_kontrast(gray, 2.0)
                         sharpened = enhanced.filter(ImageFilter.SHARPEN)
+                        nahlad = _nahlad_base64(image) if chce_nahlady else None
+                        image.close()
                         
                         # OCR
                         custom_config = r'--oem 3 --psm 6'
@@ -268,9 +544,16 @@ class DMVHandler(SimpleHTTPRequestHandler):
                             lang='eng',
                             config=custom_config
                         )
-                        
-                        if page_text:
-                            ocr_text += f"--- Strana {i+1} ---\n{page_text}\n\n"
+                        return page_text, nahlad
+                    
+                    # Tesseract beží mimo GIL - strany sa OCR-ujú paralelne, map zachová poradie
+                    ocr_text = ""
+                    with ThreadPoolExecutor(max_workers=min(OCR_WORKERS, pocet_stran or 1)) as executor:
+                        for i, (page_text, nahlad) in enumerate(executor.map(ocr_strana, range(pocet_stran))):
+                            if page_text:
+                                ocr_text += f"--- Strana {i+1} ---\n{page_text}\n\n"
+                            if nahlad:
+                                page_images_base64.append(nahlad)
                     
                     if ocr_text.strip():
                         extracted_text = ocr_text
@@ -283,22 +566,61 @@ class DMVHandler(SimpleHTTPRequestHandler):
                     print(f"[API] OCR chyba: {e}")
                     extracted_text += f"\n\n[OCR chyba: {e}]"
             
+            # 3. Náhľady (ak ich klient chce a nevznikli už pri OCR) - 150 DPI stačí
+            if not chce_nahlady:
+                print("[API] Náhľady nepožadované - preskakujem renderovanie")
+            elif not page_images_base64:
+                try:
+                    pdf2image = _lenivy_import('pdf2image')
+                    convert_from_path, pdfinfo_from_path = pdf2image.convert_from_path, pdf2image.pdfinfo_from_path
+                    
+                    print(f"[API] Poppler path: {poppler_path}")
+                    
+                    # Konvertuj PDF na obrázky po jednej strane - v pamäti je naraz len jedna strana
+                    pocet_stran = pdfinfo_from_path(tmp_path, poppler_path=poppler_path)['Pages']
+                    print(f"[API] Konvertujem PDF na obrázky: {tmp_path} ({pocet_stran} strán)")
+                    
+                    for i in range(pocet_stran):
+                        try:
+                            [image] = convert_from_path(
+                                tmp_path,
+                                dpi=150,
+                                first_page=i + 1,
+                                last_page=i + 1,
+                                poppler_path=poppler_path
+                            )
+                            img_base64 = _nahlad_base64(image)
+                            image.close()
+                            page_images_base64.append(img_base64)
+                            print(f"[API] Strana {i+1}: {len(img_base64)} bytes base64")
+                        except Exception as e:
+                            print(f"[API] Chyba pri spracovaní strany {i+1}: {e}")
+                        
+                    print(f"[API] Vytvorených {len(page_images_base64)} náhľadov")
+                    
+                except ImportError as e:
+                    print(f"[API] pdf2image nie je nainštalované: {e}")
+                except Exception as e:
+                    print(f"[API] Chyba konverzie na obrázky: {e}")
+                    import traceback
+                    traceback.print_exc()
+            
             if not extracted_text.strip():
                 extracted_text = "[Nepodarilo sa extrahovať text z PDF]"
             
             # Spracuj PDF cez processor
             try:
-                spolocnost, vozidla = self.processor.spracuj_pdf(tmp_path, over_v_registri=False)
+                with self.extractor_pool.extractor() as extractor:
+                    spolocnost, vozidla = self.processor.spracuj_pdf(
+                        tmp_path, over_v_registri=False, extractor=extractor
+                    )
             except Exception as e:
                 print(f"[API] Chyba spracovania: {e}")
                 spolocnost = Spolocnost()
                 vozidla = []
             
-            kalkulator = KalkulatorDane(rok)
-            for v in vozidla:
-                kalkulator.vypocitaj_dan_pre_vozidlo(v)
-            
-            os.unlink(tmp_path)
+            kalkulator = _kalkulator(rok)
+            kalkulator.vypocitaj_dan_pre_vozidla(vozidla)
             
             result = {
                 'success': True,
@@ -327,16 +649,23 @@ class DMVHandler(SimpleHTTPRequestHandler):
                     'zakladnaSadzba': v.sadzba or 0,
                     'sadzba': v.rocna_sadzba_1 or 0,
                     'dan': v.dan_1 or 0,
-                    'vek': kalkulator.vypocitaj_vek_v_mesiacoch(v.datum_prvej_evidencie),
+                    'vek': kalkulator.vypocitaj_vek_v_mesiacoch(v.datum_prvej_evidencie_d),
                 } for v in vozidla]
             }
             
             print(f"[API] Extrahované: {len(vozidla)} vozidiel")
-            self.send_json(result)
+            self.send_json_stream(result)
             
         except Exception as e:
             print(f"[API] Chyba: {e}")
             self.send_json({'success': False, 'error': str(e)}, 500)
+        finally:
+            # Dočasné PDF sa zmaže aj pri chybe
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
     
     def log_message(self, format, *args):
         print(f"[HTTP] {args[0]}")
@@ -344,7 +673,11 @@ class DMVHandler(SimpleHTTPRequestHandler):
 def run_server(port=None):
     if port is None:
         port = CONFIG.get('server', {}).get('port', 5100)
-    httpd = HTTPServer(('', port), DMVHandler)
+    # Paralelné OCR spúšťa viac procesov tesseract - jedno vlákno OpenMP na proces, aby sa nepreťažovali
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    # Každá požiadavka vo vlastnom (daemon) vlákne - dlhé OCR neblokuje /api/overit.
+    # Zdieľaný processor/register sú na to pripravené: DB za RLock, HTTP spojenia per vlákno.
+    httpd = ThreadingHTTPServer(('', port), DMVHandler)
     print(f"""
 ╔══════════════════════════════════════════════════════════╗
 ║         DMV Processor v2.0 - Web Server                  ║